@@ -1,4 +1,33 @@
 from .data_analyzer import DataAnalyzer
-from .visualization import Visualizer
+from .import_cache import ImportCache
+from .workbook import Workbook, list_sheets
+from .multi_import import read_files, unify_frames
+from .dtypes import MemoryReport, optimize_dtypes
+from .search_index import SearchIndex
+from .clustering import GroupingEngine
+from .profiling import ColumnProfile, column_profile, profile_dataframe
+from .association import rank_relationships
+from .correlation import correlation_matrix, top_pairs, clustered_subset
+from .crosstab import crosstab
+from .sql_engine import SQLEngine, sql_engine
+from .result_cache import ResultCache
+from .query_parser import parse_query
+from .column_index import ColumnIndex, column_index
+from .headless import render_suggestions, render_workbook
 
-__all__ = ['DataAnalyzer', 'Visualizer'] 
\ No newline at end of file
+__all__ = [
+    'DataAnalyzer', 'Visualizer', 'ImportCache', 'Workbook', 'list_sheets',
+    'read_files', 'unify_frames',
+    'MemoryReport', 'optimize_dtypes', 'SearchIndex', 'GroupingEngine',
+    'ColumnProfile', 'column_profile', 'profile_dataframe', 'rank_relationships',
+    'correlation_matrix', 'top_pairs', 'clustered_subset', 'crosstab',
+    'SQLEngine', 'sql_engine', 'ResultCache',
+    'parse_query', 'ColumnIndex', 'column_index', 'render_suggestions', 'render_workbook'
+] 
+
+def __getattr__(name):
+    # matplotlib n'est importé qu'au premier accès au Visualizer
+    if name == 'Visualizer':
+        from .visualization import Visualizer
+        return Visualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,119 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, product
+
+import numpy as np
+import pandas as pd
+
+# Au-delà, la table de contingence serait trop grande pour un score rapide
+MAX_CONTINGENCY_CELLS = 1_000_000
+# Écarts-types au-delà de la valeur attendue sans association pour qu'un
+# score soit retenu ; en dessous, il est ramené à 0 (bruit d'échantillonnage)
+NOISE_SIGMAS = 3.0
+
+
+def cramers_v(codes_a, n_a, codes_b, n_b):
+    """
+    V de Cramér entre deux colonnes factorisées (codes -1 = valeur manquante),
+    corrigé du biais (Bergsma et Wicher) : sans association, il vaut environ 0
+    quels que soient le nombre de lignes et de modalités
+    """
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    a, b = codes_a[valid], codes_b[valid]
+    n = len(a)
+    if n == 0 or n_a < 2 or n_b < 2:
+        return 0.0
+
+    observed = np.bincount(a * n_b + b, minlength=n_a * n_b).reshape(n_a, n_b).astype(np.float64)
+    rows = observed.sum(axis=1)
+    cols = observed.sum(axis=0)
+    observed = observed[rows > 0][:, cols > 0]
+    rows, cols = rows[rows > 0], cols[cols > 0]
+    r, c = len(rows), len(cols)
+    if min(r, c) < 2 or n < 2:
+        return 0.0
+
+    expected = np.outer(rows, cols) / n
+    chi2 = ((observed - expected) ** 2 / expected).sum()
+    # Sans association, le khi² suit une loi de moyenne dof et de variance 2·dof ;
+    # une table trop creuse (moins d'une ligne par case) n'est pas interprétable
+    dof = (r - 1) * (c - 1)
+    if n < r * c or chi2 <= dof + NOISE_SIGMAS * np.sqrt(2 * dof):
+        return 0.0
+    # Le phi² d'un tirage indépendant vaut en moyenne (r-1)(c-1)/(n-1)
+    phi2 = max(0.0, chi2 / n - (r - 1) * (c - 1) / (n - 1))
+    r_corrected = r - (r - 1) ** 2 / (n - 1)
+    c_corrected = c - (c - 1) ** 2 / (n - 1)
+    k = min(r_corrected, c_corrected)
+    if k <= 1:
+        return 0.0
+    return float(np.sqrt(phi2 / (k - 1)))
+
+
+def correlation_ratio(codes, n_categories, values):
+    """
+    Rapport de corrélation entre une colonne factorisée et une colonne
+    numérique, corrigé du biais : racine de l'epsilon², qui retranche de la
+    variance inter-groupes celle attendue par hasard avec autant de groupes
+    """
+    valid = (codes >= 0) & np.isfinite(values)
+    codes, values = codes[valid], values[valid]
+    if len(values) == 0 or n_categories < 2:
+        return 0.0
+
+    counts = np.bincount(codes, minlength=n_categories)
+    sums = np.bincount(codes, weights=values, minlength=n_categories)
+    mean = values.mean()
+    present = counts > 0
+    k, n = np.count_nonzero(present), len(values)
+    if k < 2 or n <= k:
+        return 0.0
+    between = (counts[present] * (sums[present] / counts[present] - mean) ** 2).sum()
+    total = ((values - mean) ** 2).sum()
+    if total == 0:
+        return 0.0
+    within_variance = (total - between) / (n - k)
+    # Sans association, le F de Fisher vaut environ 1, d'écart-type sqrt(2/(k-1))
+    if within_variance > 0 and between / (k - 1) / within_variance <= 1 + NOISE_SIGMAS * np.sqrt(2 / (k - 1)):
+        return 0.0
+    return float(np.sqrt(max(0.0, between - (k - 1) * within_variance) / total))
+
+
+def rank_relationships(df, categorical_cols, numeric_cols=(), top_n=10, max_categories=100, max_workers=None):
+    """
+    Renvoie les `top_n` paires de colonnes les plus associées, par score décroissant.
+
+    Chaque élément est (score, colonne 1, colonne 2). Les paires catégorielles
+    sont notées par le V de Cramér, les paires catégorielle × numérique (la
+    colonne numérique en second) par le rapport de corrélation, tous deux
+    corrigés du biais. Les colonnes ayant trop de modalités (identifiants,
+    texte libre) sont ignorées.
+    """
+    factorized = {}
+    for col in categorical_cols:
+        codes, uniques = pd.factorize(df[col])
+        if 2 <= len(uniques) <= max_categories:
+            factorized[col] = (codes, len(uniques))
+
+    numeric = {
+        col: df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in numeric_cols
+    }
+
+    def score(pair):
+        col1, col2 = pair
+        codes, n = factorized[col1]
+        if col2 in numeric:
+            return correlation_ratio(codes, n, numeric[col2]), col1, col2
+        codes2, n2 = factorized[col2]
+        if n * n2 > MAX_CONTINGENCY_CELLS:
+            return 0.0, col1, col2
+        return cramers_v(codes, n, codes2, n2), col1, col2
+
+    pairs = list(combinations(factorized, 2)) + list(product(factorized, numeric))
+    if not pairs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scores = executor.map(score, pairs)
+        return heapq.nlargest(top_n, scores, key=lambda item: item[0])
@@ -0,0 +1,120 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import tracing
+from .import_cache import ImportCache
+from .text import slugify
+
+# Analyseur et visualiseur propres à chaque processus, créés une seule fois
+_worker = {}
+
+
+def _init_worker(cache_dir, trace=None):
+    """
+    Initialise un processus d'analyse (backend Agg, sans Tk)
+    """
+    if trace is not None:
+        tracing.enable(sink=trace)
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    from .data_analyzer import DataAnalyzer
+
+    _worker['cache'] = ImportCache(cache_dir)
+    _worker['analyzer'] = DataAnalyzer()
+    _worker['visualizer'] = None
+
+
+def _visualizer():
+    """
+    Visualiseur du processus, créé seulement si des graphiques sont demandés
+    """
+    if _worker['visualizer'] is None:
+        from .visualization import Visualizer
+        _worker['visualizer'] = Visualizer()
+    return _worker['visualizer']
+
+
+def analyze_file(file_path, queries, out_dir=None, formats=('png',), sheet_name=0):
+    """
+    Lit un classeur et exécute chaque requête ; renvoie un résultat sérialisable en JSON.
+
+    Si out_dir est donné, le graphique de chaque requête y est enregistré.
+    """
+    timings = {}
+    result = {'file': os.path.abspath(file_path), 'queries': [], 'error': None}
+    start = time.perf_counter()
+    try:
+        with tracing.span('read', file=os.path.basename(file_path)):
+            df = _worker['cache'].read_excel(file_path, sheet_name=sheet_name, optimize=True)
+        timings['read'] = time.perf_counter() - start
+        result['rows'], result['columns'] = df.shape
+    except Exception as e:
+        result['error'] = str(e)
+        result['seconds'] = {'total': time.perf_counter() - start}
+        return result
+
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    for i, query in enumerate(queries, start=1):
+        entry = {'query': query, 'error': None, 'files': []}
+        query_start = time.perf_counter()
+        try:
+            analysis = _worker['analyzer'].analyze(df, query)
+            entry['seconds'] = {'analyze': time.perf_counter() - query_start}
+            entry['columns'] = [str(col) for col in analysis['columns']]
+            entry['intent'] = analysis['intent']['type']
+            entry['chart_type'] = analysis['chart_type']
+            entry['rows'] = len(analysis['data'])
+
+            if out_dir is not None:
+                render_start = time.perf_counter()
+                base = os.path.join(out_dir, name, f"{i:03d}_{slugify(query)}")
+                os.makedirs(os.path.dirname(base), exist_ok=True)
+                for fmt in formats:
+                    path = f"{base}.{fmt}"
+                    _visualizer().render_to_file(
+                        analysis['data'],
+                        analysis,
+                        path,
+                        chart_type=analysis['chart_type']
+                    )
+                    entry['files'].append(path)
+                entry['seconds']['render'] = time.perf_counter() - render_start
+        except Exception as e:
+            entry['error'] = str(e)
+            entry.setdefault('seconds', {})
+        entry['seconds']['total'] = time.perf_counter() - query_start
+        result['queries'].append(entry)
+
+    timings['total'] = time.perf_counter() - start
+    result['seconds'] = timings
+    return result
+
+
+def analyze_files(file_paths, queries, out_dir=None, formats=('png',), max_workers=None,
+                  cache_dir=None, on_result=None, trace=None):
+    """
+    Analyse plusieurs classeurs en parallèle (un processus par classeur).
+
+    Renvoie les résultats dans l'ordre des fichiers ; on_result(result) est
+    appelé dès qu'un fichier est terminé. Si `trace` est un fichier, les
+    mesures de chaque étape y sont ajoutées (voir analysis.tracing).
+    """
+    cache_dir = ImportCache(cache_dir).cache_dir
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(cache_dir, trace)
+    ) as executor:
+        futures = {
+            executor.submit(analyze_file, path, list(queries), out_dir, tuple(formats)): i
+            for i, path in enumerate(file_paths)
+        }
+        results = [None] * len(futures)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if on_result is not None:
+                on_result(results[futures[future]])
+        return results
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from . import tracing
+from .fingerprint import series_fingerprint
+
+
+class GroupingEngine:
+    """
+    Regroupement des valeurs textuelles similaires d'une colonne.
+
+    Seules les valeurs distinctes sont vectorisées (n-grammes de caractères
+    hachés, sans apprentissage de vocabulaire) puis regroupées par
+    MiniBatchKMeans pondéré par leur nombre d'occurrences. La correspondance
+    valeur -> groupe est mise en cache par empreinte du contenu de la colonne.
+    """
+
+    def __init__(self, n_clusters=5, max_workers=None, cache_size=128):
+        self.n_clusters = n_clusters
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._vectorizer = None
+
+    def group_columns(self, df, columns, progress=None):
+        """
+        Renvoie {colonne: Series des numéros de groupe}, colonnes traitées en parallèle
+        """
+        columns = list(columns)
+        if not columns:
+            return {}
+
+        results = {}
+        group_column = tracing.bind(self.group_column)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(group_column, df[col]): col for col in columns}
+            for done, future in enumerate(as_completed(futures), start=1):
+                col = futures[future]
+                results[col] = future.result()
+                if progress is not None:
+                    progress(done / len(columns), f"Regroupement de {col}...")
+        return results
+
+    def group_column(self, series):
+        """
+        Remplace chaque valeur de la colonne par le numéro de son groupe
+        """
+        with tracing.span('group_column', column=series.name):
+            mapping = self.cluster_map(series)
+            if isinstance(series.dtype, pd.CategoricalDtype) and not series.hasnans:
+                # Correspondance appliquée aux codes : une recherche par catégorie, pas par ligne
+                # (les catégories absentes de la colonne n'ont pas de groupe : -1, jamais utilisé)
+                labels = mapping.reindex(series.cat.categories, fill_value=-1).to_numpy()
+                return pd.Series(labels[series.cat.codes.to_numpy()], index=series.index, name=series.name)
+            return series.map(mapping)
+
+    def cluster_map(self, series):
+        """
+        Correspondance valeur -> groupe pour une colonne
+        """
+        counts = series.value_counts(dropna=False)
+        # Catégories absentes de la colonne (comptées 0) : rien à regrouper
+        counts = counts[counts > 0]
+        key = series_fingerprint(counts, index=True)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        labels = self._fit(counts.index, counts.to_numpy())
+        mapping = pd.Series(labels, index=counts.index)
+
+        with self._lock:
+            self._cache[key] = mapping
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return mapping
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _fit(self, values, weights):
+        """
+        Regroupe les valeurs distinctes, pondérées par leur fréquence
+        """
+        n_clusters = min(self.n_clusters, len(values))
+        if len(values) <= n_clusters:
+            # Pas assez de valeurs pour regrouper : un groupe par valeur
+            return np.arange(len(values))
+
+        # scikit-learn est long à importer : chargé au premier regroupement seulement
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        if self._vectorizer is None:
+            self._vectorizer = HashingVectorizer(
+                analyzer='char_wb',
+                ngram_range=(2, 4),
+                n_features=2 ** 16,
+                alternate_sign=False
+            )
+        with tracing.span('vectorize', values=len(values)):
+            matrix = self._vectorizer.transform(values.astype(str))
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=1024,
+            n_init=3,
+            random_state=0
+        )
+        with tracing.span('kmeans', clusters=n_clusters):
+            return kmeans.fit_predict(matrix, sample_weight=weights)
@@ -0,0 +1,167 @@
+import re
+from functools import lru_cache
+
+from .text import FRENCH_STOP_WORDS, fold_text
+
+_TOKENS = re.compile(r'[a-z0-9]+')
+
+# Mots qui séparent les colonnes d'une requête portant sur plusieurs colonnes
+_SEPARATORS = re.compile(
+    r'\b(?:versus|vs|contre|face a|par rapport a|en fonction de|selon|par|et|avec)\b'
+)
+
+_STOP_WORDS = frozenset(fold_text(word) for word in FRENCH_STOP_WORDS)
+
+
+def normalize_tokens(text):
+    """
+    Mots significatifs d'un texte : sans accents, sans mots vides, au singulier
+    """
+    tokens = []
+    for token in _TOKENS.findall(fold_text(text)):
+        if token in _STOP_WORDS:
+            continue
+        # Pluriel régulier : "villes" -> "ville", "prix" -> "pri" (appliqué des deux côtés)
+        if len(token) > 3 and token[-1] in 'sx':
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _trigrams(token):
+    padded = f'^{token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ColumnIndex:
+    """
+    Index des noms de colonnes pour retrouver rapidement celles qu'une requête désigne.
+
+    Chaque nom est découpé en mots normalisés (voir normalize_tokens). Un index
+    inversé associe chaque mot aux colonnes qui le contiennent, et un index de
+    trigrammes associe chaque trigramme aux mots connus : un mot de la requête
+    absent du vocabulaire (faute de frappe, variante) est rapproché des mots
+    qui partagent le plus de trigrammes avec lui. Une recherche ne parcourt
+    donc que les colonnes candidates, jamais toutes les colonnes.
+    """
+
+    # Similarité (coefficient de Dice sur les trigrammes) minimale d'un rapprochement approché
+    MIN_SIMILARITY = 0.5
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._column_tokens = []
+        self._token_columns = {}
+        self._token_trigrams = {}
+        self._trigram_tokens = {}
+
+        for i, column in enumerate(self.columns):
+            tokens = set(normalize_tokens(str(column)))
+            self._column_tokens.append(tokens)
+            for token in tokens:
+                self._token_columns.setdefault(token, []).append(i)
+
+        for token in self._token_columns:
+            trigrams = _trigrams(token)
+            self._token_trigrams[token] = trigrams
+            for trigram in trigrams:
+                self._trigram_tokens.setdefault(trigram, []).append(token)
+
+    def lookup(self, text, limit=5):
+        """
+        Colonnes les plus proches de `text`, sous forme de paires (colonne, score) par score décroissant.
+
+        Chaque mot de la requête apporte 1 point aux colonnes qui le contiennent,
+        ou sa similarité au mot le plus proche s'il n'est pas dans le vocabulaire.
+        À score égal, la colonne dont le nom est le mieux couvert passe en premier.
+        """
+        return self._ranked(self._scores(text))[:limit]
+
+    def resolve(self, text, max_columns=2):
+        """
+        Colonnes désignées par une requête, dans l'ordre où elles y apparaissent.
+
+        La requête est découpée sur les mots de liaison ("X versus Y",
+        "X par Y", "X et Y"...) ; chaque partie désigne au plus une colonne.
+        """
+        # Une colonne dont le nom contient tous les mots reconnus de la requête
+        # ("répartition des ventes par région") est retenue seule
+        scores = self._scores(text)
+        best = self._ranked(scores)[:1]
+        recognized = set().union(*scores.values()) if scores else set()
+        if best and best[0][1] >= len(recognized):
+            return [best[0][0]]
+
+        columns = []
+        for part in _SEPARATORS.split(fold_text(text)):
+            for column, _ in self.lookup(part, limit=max_columns + 1):
+                if column not in columns:
+                    columns.append(column)
+                    break
+            if len(columns) == max_columns:
+                break
+
+        if not columns and best:
+            columns = [best[0][0]]
+        return columns
+
+    def _scores(self, text):
+        """
+        {position de colonne: {mot de la requête: similarité}} pour les colonnes candidates
+        """
+        scores = {}
+        for token in dict.fromkeys(normalize_tokens(text)):
+            for match, similarity in self._matches(token):
+                for i in self._token_columns[match]:
+                    # Un mot de la requête ne compte qu'une fois par colonne
+                    matched = scores.setdefault(i, {})
+                    matched[token] = max(matched.get(token, 0), similarity)
+        return scores
+
+    def _ranked(self, scores):
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (
+                -sum(item[1].values()),
+                -len(item[1]) / max(1, len(self._column_tokens[item[0]])),
+                item[0]
+            )
+        )
+        return [(self.columns[i], sum(matched.values())) for i, matched in ranked]
+
+    def _matches(self, token):
+        """
+        Mots du vocabulaire correspondant à `token`, avec leur similarité
+        """
+        if token in self._token_columns:
+            return [(token, 1.0)]
+        if len(token) < 3:
+            return []
+
+        trigrams = _trigrams(token)
+        shared = {}
+        for trigram in trigrams:
+            for candidate in self._trigram_tokens.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        matches = []
+        for candidate, count in shared.items():
+            similarity = 2 * count / (len(trigrams) + len(self._token_trigrams[candidate]))
+            if similarity >= self.MIN_SIMILARITY:
+                matches.append((candidate, similarity))
+        if not matches:
+            return []
+        best = max(similarity for _, similarity in matches)
+        return [(candidate, similarity) for candidate, similarity in matches if similarity == best]
+
+
+@lru_cache(maxsize=16)
+def _cached_index(schema):
+    return ColumnIndex(schema)
+
+
+def column_index(columns):
+    """
+    Index des colonnes, construit une seule fois par schéma (liste des noms de colonnes)
+    """
+    return _cached_index(tuple(columns))
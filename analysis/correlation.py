@@ -0,0 +1,341 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import is_numeric
+from .fingerprint import data_fingerprint
+
+METHODS = ('pearson', 'spearman')
+
+# Nombre de colonnes par bloc : chaque paire de blocs est un produit matriciel float32
+BLOCK_SIZE = 256
+
+# Matrices déjà calculées : (empreinte des données, colonnes, méthode, min_periods) -> DataFrame
+_matrices = OrderedDict()
+_matrices_lock = threading.Lock()
+_MATRIX_CACHE_SIZE = 8
+
+
+def correlation_matrix(df, columns=None, method='pearson', min_periods=1, max_workers=None):
+    """
+    Matrice de corrélation (float32) des colonnes numériques, calculée une
+    seule fois pour un même contenu des données.
+
+    Les valeurs manquantes sont traitées paire par paire, comme DataFrame.corr :
+    le coefficient de deux colonnes porte sur les lignes où les deux sont
+    renseignées (NaN s'il y en a moins de `min_periods`). Pour Spearman, les
+    rangs sont calculés une fois par colonne, puis recalculés sur les lignes
+    communes pour les seules paires dont les valeurs manquantes diffèrent.
+
+    Le calcul est découpé en blocs de colonnes traités en parallèle : la
+    mémoire de travail dépend de la taille des blocs, pas du nombre de colonnes.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode de corrélation inconnue : {method}")
+    columns = list(df.columns if columns is None else columns)
+    key = (data_fingerprint(df), tuple(columns), method, min_periods)
+    with _matrices_lock:
+        if key in _matrices:
+            _matrices.move_to_end(key)
+            return _matrices[key]
+
+    values = _numeric_matrix(df, columns)
+    if method == 'spearman':
+        result = _spearman(values, min_periods, max_workers)
+    else:
+        result = _blocked_corr(values, min_periods, max_workers)
+    matrix = pd.DataFrame(result, index=columns, columns=columns)
+
+    with _matrices_lock:
+        _matrices[key] = matrix
+        while len(_matrices) > _MATRIX_CACHE_SIZE:
+            _matrices.popitem(last=False)
+    return matrix
+
+
+def top_pairs(df, columns=None, k=20, method='pearson', min_periods=1):
+    """
+    Les `k` paires de colonnes les plus corrélées (en valeur absolue),
+    sous forme de triplets (colonne, colonne, coefficient)
+    """
+    matrix = correlation_matrix(df, columns, method=method, min_periods=min_periods)
+    values = matrix.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    strength = np.abs(values[rows, cols])
+    strength = np.where(np.isnan(strength), -1, strength)
+    k = min(k, len(strength))
+    if k == 0:
+        return []
+    best = np.argpartition(-strength, k - 1)[:k]
+    best = best[np.argsort(-strength[best], kind='stable')]
+    return [
+        (matrix.index[rows[i]], matrix.columns[cols[i]], float(values[rows[i], cols[i]]))
+        for i in best
+        if strength[i] >= 0
+    ]
+
+
+def cluster_order(matrix):
+    """
+    Ordre des colonnes rapprochant celles qui sont corrélées entre elles
+    (classification hiérarchique sur la distance 1 - |r|)
+    """
+    if len(matrix) < 3:
+        return list(matrix.columns)
+    # scipy est installé avec scikit-learn ; importé seulement ici
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    distance = 1 - np.abs(np.nan_to_num(matrix.to_numpy(dtype=np.float64), nan=0.0))
+    distance = (distance + distance.T) / 2
+    np.fill_diagonal(distance, 0)
+    order = leaves_list(linkage(squareform(np.clip(distance, 0, 1), checks=False), method='average'))
+    return [matrix.columns[i] for i in order]
+
+
+def clustered_subset(df, columns=None, max_columns=50, method='pearson', min_periods=1):
+    """
+    Sous-matrice des `max_columns` colonnes les plus corrélées aux autres,
+    réordonnée pour regrouper les colonnes corrélées entre elles
+    """
+    matrix = correlation_matrix(df, columns, method=method, min_periods=min_periods)
+    if len(matrix) > max_columns:
+        strength = np.nan_to_num(np.abs(matrix.to_numpy()), nan=0.0).sum(axis=0)
+        keep = np.sort(np.argpartition(-strength, max_columns - 1)[:max_columns])
+        matrix = matrix.iloc[keep, keep]
+    order = cluster_order(matrix)
+    return matrix.loc[order, order]
+
+
+def _numeric_matrix(df, columns):
+    """
+    Colonnes sous forme de tableau float32 (valeurs non numériques -> NaN)
+    """
+    values = np.empty((len(df), len(columns)), dtype=np.float32)
+    for j, col in enumerate(columns):
+        series = df[col]
+        if not is_numeric(series):
+            # Colonnes numériques dont les vides ont été remplacés par '' au prétraitement
+            series = pd.to_numeric(series, errors='coerce')
+        values[:, j] = series.to_numpy(dtype=np.float32, na_value=np.nan)
+    return values
+
+
+def _blocked_corr(values, min_periods, max_workers):
+    """
+    Corrélation de Pearson par paires de blocs de colonnes
+    """
+    n_columns = values.shape[1]
+    valid = ~np.isnan(values)
+    complete = bool(valid.all())
+
+    # Colonnes centrées et réduites : les produits float32 restent bien conditionnés
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(values, axis=0) if len(values) else np.zeros(n_columns, dtype=np.float32)
+        scale = np.nanstd(values, axis=0) if len(values) else np.ones(n_columns, dtype=np.float32)
+    scale = np.where(scale > 0, scale, 1).astype(np.float32)
+    standardized = np.where(valid, (values - mean) / scale, 0).astype(np.float32)
+    mask = valid.astype(np.float32)
+
+    result = np.full((n_columns, n_columns), np.nan, dtype=np.float32)
+    blocks = [slice(start, min(start + BLOCK_SIZE, n_columns)) for start in range(0, n_columns, BLOCK_SIZE)]
+    pairs = [(a, b) for i, a in enumerate(blocks) for b in blocks[i:]]
+
+    def compute(a, b):
+        if complete:
+            block = _complete_block(standardized[:, a], standardized[:, b], len(values), min_periods)
+        else:
+            block = _pairwise_block(standardized[:, a], standardized[:, b], mask[:, a], mask[:, b], min_periods)
+        result[a, b] = block
+        result[b, a] = block.T
+
+    # Les produits matriciels libèrent le GIL : les blocs sont calculés en parallèle
+    if len(pairs) == 1:
+        compute(*pairs[0])
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(compute, a, b) for a, b in pairs]:
+                future.result()
+
+    # Diagonale : 1 pour toute colonne non constante ayant assez de valeurs
+    diagonal = np.diagonal(result)
+    np.fill_diagonal(result, np.where(np.isnan(diagonal), np.nan, 1))
+    return result
+
+
+def _spearman(values, min_periods, max_workers):
+    """
+    Corrélation de Spearman : Pearson des rangs de chaque colonne, corrigée
+    pour les paires dont les valeurs manquantes diffèrent (voir _spearman_partial_pairs)
+    """
+    # Une ligne par colonne : tris, sommes cumulées et lectures dans l'ordre
+    # de tri portent sur des données contiguës
+    columns = np.ascontiguousarray(values.T)
+    valid = ~np.isnan(columns)
+    order = np.argsort(columns, axis=1, kind='stable')
+    sorted_columns = np.take_along_axis(columns, order, axis=1)
+
+    ranks = _unsorted(_masked_ranks(sorted_columns, np.take_along_axis(valid, order, axis=1)), order)
+    ranks[~valid] = np.nan
+    result = _blocked_corr(np.ascontiguousarray(ranks.T, dtype=np.float32), min_periods, max_workers)
+    if not valid.all():
+        _spearman_partial_pairs(valid, order, sorted_columns, result, min_periods)
+    return result
+
+
+def _spearman_partial_pairs(valid, order, sorted_columns, result, min_periods):
+    """
+    Corrige en place les coefficients de Spearman des paires dont les lignes
+    renseignées diffèrent : les rangs y sont recalculés sur les seules lignes
+    communes aux deux colonnes, comme DataFrame.corr(method='spearman')
+
+    Les colonnes (une par ligne de `valid`, triées selon `order`) sont
+    regroupées par motif de valeurs manquantes. Pour chaque motif incomplet,
+    les rangs d'un bloc de colonnes sur ses lignes sont calculés en une
+    fois, par sommes cumulées dans l'ordre de tri de chaque colonne.
+    """
+    n_columns, n_rows = valid.shape
+    # Motif de chaque colonne (colonnes aux mêmes lignes renseignées -> même motif)
+    patterns, pattern_of = np.unique(np.packbits(valid, axis=1), axis=0, return_inverse=True)
+    pattern_of = pattern_of.ravel()
+    patterns = np.unpackbits(patterns, axis=1, count=n_rows).astype(bool)
+
+    done = np.zeros(len(patterns), dtype=bool)
+    for p in np.flatnonzero(~patterns.all(axis=1)):
+        rows = patterns[p]
+        n_common = int(rows.sum())
+        done[p] = True
+        for start in range(0, n_columns, BLOCK_SIZE):
+            block = np.arange(start, min(start + BLOCK_SIZE, n_columns))
+            # Paires déjà exactes (même motif) ou traitées avec un motif précédent
+            block = block[~done[pattern_of[block]]]
+            if not len(block):
+                continue
+            block_valid = valid[block]
+            common = block_valid & rows
+            count = common.sum(axis=1)
+            # Rangs de chaque colonne du bloc sur les lignes du motif (les valeurs
+            # manquantes de la colonne, en fin de tri, n'en changent pas les autres rangs)
+            ranks_y = _unsorted(
+                _masked_ranks(sorted_columns[block], rows[order[block]]),
+                order[block]
+            )
+            ranks_y *= common
+            sum_yy = np.einsum('ij,ij->i', ranks_y, ranks_y)
+            for i in np.flatnonzero(pattern_of == p):
+                # Lignes renseignées de la colonne i, dans son ordre de tri
+                by_i = order[i, :n_common]
+                include = np.take(block_valid, by_i, axis=1)
+                ranks_x = _masked_ranks(sorted_columns[i, None, :n_common], include)
+                ranks_x *= include
+                result[i, block] = result[block, i] = _rank_corr(
+                    np.einsum('ij,ij->i', ranks_x, np.take(ranks_y, by_i, axis=1)),
+                    np.einsum('ij,ij->i', ranks_x, ranks_x),
+                    sum_yy,
+                    count,
+                    min_periods
+                )
+
+
+def _masked_ranks(sorted_values, include):
+    """
+    Rangs moyens (ex aequo compris) parmi les seules positions `include`, pour
+    des lignes de valeurs déjà triées ; `sorted_values` peut n'avoir qu'une
+    ligne, commune à toutes celles de `include`
+    """
+    # Sans ex aequo, le rang est le nombre de positions retenues jusque-là
+    counts = np.cumsum(include, axis=1, dtype=np.int32)
+    # Rang d'un groupe d'ex aequo : moyenne entre le nombre de positions
+    # retenues avant le groupe et celui à la fin du groupe (NaN n'est égal à rien)
+    equal = np.zeros(sorted_values.shape, dtype=bool)
+    equal[:, 1:] = sorted_values[:, 1:] == sorted_values[:, :-1]
+    n_equal = int(np.count_nonzero(equal))
+    if n_equal == 0:
+        return counts.astype(np.float64)
+
+    if n_equal * 8 > equal.size:
+        # Nombreux ex aequo : bornes des groupes propagées le long de chaque ligne
+        last = np.ones(equal.shape, dtype=bool)
+        last[:, :-1] = ~equal[:, 1:]
+        before = np.maximum.accumulate(np.where(equal, 0, counts - include), axis=1)
+        through = np.minimum.accumulate(np.where(last, counts, include.shape[1])[:, ::-1], axis=1)[:, ::-1]
+        return (before + through + 1) / 2
+
+    # Quelques ex aequo : seules les positions des groupes sont corrigées
+    ranks = counts.astype(np.float64)
+    tied = equal.copy()
+    tied[:, :-1] |= equal[:, 1:]
+    rows, positions = np.nonzero(tied)
+    index = np.arange(len(positions))
+    first = ~equal[rows, positions]
+    last = np.ones(len(positions), dtype=bool)
+    last[:-1] = first[1:]
+    group_start = positions[np.maximum.accumulate(np.where(first, index, 0))]
+    group_end = positions[np.minimum.accumulate(np.where(last, index, len(index) - 1)[::-1])[::-1]]
+    if len(sorted_values) == 1:
+        # Groupes communs à toutes les lignes de `include`
+        before = counts[:, group_start] - include[:, group_start]
+        ranks[:, positions] = (before + counts[:, group_end] + 1) / 2
+    else:
+        before = counts[rows, group_start] - include[rows, group_start]
+        ranks[rows, positions] = (before + counts[rows, group_end] + 1) / 2
+    return ranks
+
+
+def _unsorted(sorted_ranks, order):
+    """
+    Remet dans l'ordre des lignes des valeurs calculées dans l'ordre de tri `order`
+    """
+    ranks = np.empty(sorted_ranks.shape)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=1)
+    return ranks
+
+
+def _rank_corr(sum_xy, sum_xx, sum_yy, count, min_periods):
+    """
+    Corrélation de Pearson de rangs (de 1 à `count`) à partir de leurs sommes de produits
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (count + 1) / 2
+        cov = sum_xy / count - mean * mean
+        var_x = sum_xx / count - mean * mean
+        var_y = sum_yy / count - mean * mean
+        corr = cov / np.sqrt(var_x * var_y)
+    # Colonne constante sur les lignes communes : pas de corrélation
+    corr[(count < max(min_periods, 2)) | (var_x <= 1e-9 * count * count) | (var_y <= 1e-9 * count * count)] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+def _complete_block(x, y, n_rows, min_periods):
+    if n_rows < max(min_periods, 2):
+        return np.full((x.shape[1], y.shape[1]), np.nan, dtype=np.float32)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        norm_x = np.sqrt(np.einsum('ij,ij->j', x, x))
+        norm_y = np.sqrt(np.einsum('ij,ij->j', y, y))
+        corr = (x.T @ y) / np.outer(norm_x, norm_y)
+    return np.clip(corr, -1, 1).astype(np.float32)
+
+
+def _pairwise_block(x, y, mask_x, mask_y, min_periods):
+    """
+    Corrélation sur les lignes renseignées dans les deux colonnes de chaque paire
+    (valeurs manquantes mises à 0 dans x et y)
+    """
+    count = mask_x.T @ mask_y
+    sum_x = x.T @ mask_y
+    sum_y = mask_x.T @ y
+    sum_xx = (x * x).T @ mask_y
+    sum_yy = mask_x.T @ (y * y)
+    sum_xy = x.T @ y
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_xy - sum_x * sum_y / count
+        var_x = sum_xx - sum_x * sum_x / count
+        var_y = sum_yy - sum_y * sum_y / count
+        corr = cov / np.sqrt(var_x * var_y)
+    # Variance nulle (aux erreurs d'arrondi près) sur les lignes communes : pas de corrélation
+    degenerate = (var_x <= 1e-6 * count) | (var_y <= 1e-6 * count)
+    corr[(count < max(min_periods, 2)) | degenerate] = np.nan
+    return np.clip(corr, -1, 1).astype(np.float32)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# Libellé de la catégorie regroupant les valeurs hors des plus fréquentes
+OTHER_LABEL = 'Autres'
+
+
+def crosstab(x, y, top_rows=10, top_columns=10, other=OTHER_LABEL):
+    """
+    Tableau croisé des effectifs de deux colonnes, borné à leurs catégories
+    les plus fréquentes.
+
+    Les `top_rows` valeurs les plus fréquentes de `x` (et `top_columns` de
+    `y`) gardent leur ligne (colonne), triées par effectif décroissant ;
+    les autres sont cumulées dans `other`. Les valeurs manquantes sont
+    ignorées, comme dans groupby().value_counts().
+
+    Le calcul porte sur les codes entiers des colonnes : les effectifs par
+    valeur donnent les catégories retenues, puis chaque ligne est comptée
+    directement dans sa case du tableau réduit. Ni le tableau complet ni la
+    liste des couples observés ne sont construits : la mémoire dépend du
+    nombre de catégories, pas de leur produit.
+    """
+    codes_x, uniques_x = pd.factorize(x)
+    codes_y, uniques_y = pd.factorize(y)
+    valid = (codes_x >= 0) & (codes_y >= 0)
+    if not valid.all():
+        codes_x, codes_y = codes_x[valid], codes_y[valid]
+
+    rows, row_labels, row_other = _fold(codes_x, uniques_x, top_rows, other)
+    cols, col_labels, col_other = _fold(codes_y, uniques_y, top_columns, other)
+
+    counts = np.bincount(
+        rows * len(col_labels) + cols,
+        minlength=len(row_labels) * len(col_labels)
+    ).reshape(len(row_labels), len(col_labels))
+
+    table = pd.DataFrame(
+        counts,
+        index=pd.Index(row_labels, name=getattr(x, 'name', None)),
+        columns=pd.Index(col_labels, name=getattr(y, 'name', None))
+    )
+    # La catégorie « autres » n'est gardée que si elle contient des valeurs
+    if row_other and not counts[-1].any():
+        table = table.iloc[:-1]
+    if col_other and not counts[:, -1].any():
+        table = table.iloc[:, :-1]
+    return table
+
+
+def _fold(codes, uniques, top, other):
+    """
+    Codes ramenés aux `top` valeurs les plus fréquentes (0..top-1), les autres
+    valant `top` ; renvoie (codes, libellés, présence de la catégorie `other`)
+    """
+    totals = np.bincount(codes, minlength=len(uniques))
+    # À effectif égal, l'ordre d'apparition départage les valeurs ; les valeurs
+    # sans effectif (lignes écartées, catégories inutilisées) ne sont pas affichées
+    order = np.argsort(-totals, kind='stable')[:top]
+    order = order[totals[order] > 0]
+    mapping = np.full(len(uniques), len(order), dtype=np.int64)
+    mapping[order] = np.arange(len(order))
+    labels = [uniques[i] for i in order]
+    has_other = len(order) < np.count_nonzero(totals)
+    if has_other:
+        labels.append(other)
+    return mapping[codes], labels, has_other
@@ -1,35 +1,42 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 import re
-import os
 import json
-
-# Force le chemin NLTK
-nltk.data.path.append(r'C:\\Users\\Ben Djibril\\AppData\\Roaming\\nltk_data')
+import threading
+from collections import OrderedDict
+from .clustering import GroupingEngine
+from .fingerprint import data_version, shared_copy
+from .profiling import column_profile
+from .association import rank_relationships
+from .text import FRENCH_STOP_WORDS
+from .query_parser import parse_query
+from .column_index import column_index
+from .dtypes import is_text, numeric_columns, text_columns
+from .sql_engine import is_select, sql_engine
+from .result_cache import ResultCache
+from . import tracing
 
 class DataAnalyzer:
-    def __init__(self):
-        # Configuration du chemin NLTK
-        nltk_data_path = os.path.join(os.path.expanduser("~"), "nltk_data")
-        if not os.path.exists(nltk_data_path):
-            os.makedirs(nltk_data_path)
-        nltk.data.path.append(nltk_data_path)
-        
-        # Téléchargement des ressources NLTK nécessaires
-        required_nltk_resources = ['punkt', 'stopwords', 'averaged_perceptron_tagger', 'wordnet']
-        for resource in required_nltk_resources:
-            try:
-                nltk.data.find(f'tokenizers/{resource}' if resource == 'punkt' else f'corpora/{resource}')
-            except LookupError:
-                nltk.download(resource, download_dir=nltk_data_path)
-                
-        self.stop_words = set(stopwords.words('french'))
-        self.suggestions_cache = {}
+    # Nombre de jeux de données prétraités conservés en mémoire
+    PREPROCESS_CACHE_SIZE = 2
+    # Nombre maximal de suggestions de relations entre colonnes
+    MAX_RELATIONSHIP_SUGGESTIONS = 10
+    # Score d'association en dessous duquel une relation n'est pas proposée
+    MIN_RELATIONSHIP_SCORE = 0.1
+    # Graphiques et intentions dont les colonnes textuelles servent de groupes :
+    # elles gardent leurs valeurs d'origine au lieu d'être regroupées par clustering
+    UNCLUSTERED_CHART_TYPES = ('box',)
+    UNCLUSTERED_INTENTS = ('comparaison',)
+    
+    def __init__(self, result_cache=None):
+        self.stop_words = FRENCH_STOP_WORDS
+        # Suggestions et résultats d'analyse, par contenu des données et requête
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.grouping_engine = GroupingEngine()
+        # Partagé par les analyses exécutées en parallèle (une analyse remplacée
+        # continue jusqu'à sa fin à côté de la nouvelle)
+        self._preprocess_cache = OrderedDict()
+        self._preprocess_lock = threading.Lock()
         
     def get_suggestions(self, df):
         """
@@ -38,17 +45,19 @@ class DataAnalyzer:
         if df is None or df.empty:
             return []
             
-        # Création d'une clé unique pour le cache
-        cache_key = hash(str(df.columns.tolist()) + str(df.dtypes.tolist()))
+        # Clé tirée du contenu : deux fichiers de même structure n'ont pas
+        # les mêmes suggestions
+        cache_key = self.result_cache.key('suggestions', df)
         
         # Vérification du cache
-        if cache_key in self.suggestions_cache:
-            return self.suggestions_cache[cache_key]
+        suggestions = self.result_cache.get(cache_key)
+        if suggestions is not None:
+            return suggestions
             
         suggestions = []
         
         # Analyse des colonnes numériques
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = pd.Index(numeric_columns(df))
         if len(numeric_cols) > 0:
             suggestions.append({
                 'type': 'distribution',
@@ -66,10 +75,10 @@ class DataAnalyzer:
                 })
         
         # Analyse des colonnes catégorielles
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = pd.Index(text_columns(df))
         if len(categorical_cols) > 0:
             for col in categorical_cols:
-                unique_values = df[col].nunique()
+                unique_values = column_profile(df, col).distinct_count
                 if unique_values < 10:  # Pour les colonnes avec peu de valeurs uniques
                     suggestions.append({
                         'type': 'pie',
@@ -85,132 +94,243 @@ class DataAnalyzer:
                         'columns': [col]
                     })
         
-        # Analyse des relations entre colonnes
-        if len(categorical_cols) > 1:
-            for i, col1 in enumerate(categorical_cols):
-                for col2 in categorical_cols[i+1:]:
-                    suggestions.append({
-                        'type': 'comparison',
-                        'title': f'Relation entre {col1} et {col2}',
-                        'description': f'Analyser la relation entre {col1} et {col2}',
-                        'columns': [col1, col2]
-                    })
+        # Analyse des relations entre colonnes : seules les paires les plus
+        # associées sont proposées
+        relationships = rank_relationships(
+            df,
+            categorical_cols,
+            numeric_cols,
+            top_n=self.MAX_RELATIONSHIP_SUGGESTIONS
+        )
+        for score, col1, col2 in relationships:
+            if score < self.MIN_RELATIONSHIP_SCORE:
+                continue
+            if col2 in numeric_cols:
+                # Texte × nombre : distribution des valeurs par groupe (boîtes)
+                suggestions.append({
+                    'type': 'box',
+                    'title': f'{col2} selon {col1} (association {score:.2f})',
+                    'description': f'Distribution de {col2} par {col1}',
+                    'columns': [col2, col1],
+                    'score': score
+                })
+                continue
+            suggestions.append({
+                'type': 'comparison',
+                'title': f'Relation entre {col1} et {col2} (association {score:.2f})',
+                'description': f'Analyser la relation entre {col1} et {col2}',
+                'columns': [col1, col2],
+                'score': score
+            })
         
         # Mise en cache des suggestions
-        self.suggestions_cache[cache_key] = suggestions
+        self.result_cache.put(cache_key, suggestions)
         return suggestions
         
-    def analyze(self, df, query):
+    def analyze(self, df, query, progress=None):
         """
         Analyse intelligente de la requête utilisateur
+
+        `progress(fraction, message)` est appelé entre les étapes ; il peut
+        lever une exception pour interrompre l'analyse.
         """
-        df_cleaned = self._preprocess_data(df)
-        query_intent = self._analyze_query(query)
+        if progress is None:
+            progress = lambda fraction, message=None: None
 
-        # Détection automatique de la colonne cible
-        colonne_cible = self._detect_column_from_query(df_cleaned, query)
-        if not colonne_cible:
-            raise Exception(
-                "Aucune colonne correspondante trouvée dans la requête. "
-                "Merci de préciser la colonne à analyser ou de reformuler."
-            )
+        # Même contenu et même requête (à la casse, aux accents et aux espaces
+        # près) : le résultat déjà calculé est réutilisé
+        cache_key = self.result_cache.key('analysis', df, query)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            progress(1.0, "Analyse terminée")
+            return dict(cached, data=shared_copy(cached['data']))
+            
+        with tracing.span('analyze', query=query, rows=len(df)):
+            progress(0.0, "Prétraitement des données...")
+            with tracing.span('preprocess'):
+                df_cleaned = self._preprocess_data(df)
+            progress(0.3, "Analyse de la requête...")
+            with tracing.span('parse_query'):
+                parsed = parse_query(query)
+                query_intent = self._intent(parsed)
 
-        # Détection du type de graphique
-        chart_type = self._detect_chart_type_from_query(query)
+                # Détection automatique des colonnes citées ("X", "X versus Y")
+                relevant_columns = column_index(df_cleaned.columns).resolve(query)
+            if not relevant_columns:
+                raise Exception(
+                    "Aucune colonne correspondante trouvée dans la requête. "
+                    "Merci de préciser la colonne à analyser ou de reformuler."
+                )
 
-        relevant_columns = [colonne_cible]
-        df_grouped = self._group_similar_data(df_cleaned, relevant_columns)
+            # Détection du type de graphique
+            chart_type = parsed.chart_type
 
-        return {
+            progress(0.4, "Regroupement des données similaires...")
+            if chart_type in self.UNCLUSTERED_CHART_TYPES or query_intent['type'] in self.UNCLUSTERED_INTENTS:
+                grouped_columns = []
+            else:
+                grouped_columns = relevant_columns
+            with tracing.span('group', columns=len(grouped_columns)):
+                df_grouped = self._group_similar_data(df_cleaned, grouped_columns, progress=progress)
+            progress(1.0, "Analyse terminée")
+
+        results = {
             'data': df_grouped,
             'columns': relevant_columns,
             'intent': query_intent,
-            'chart_type': chart_type
+            'chart_type': chart_type,
+            'cache_key': cache_key
         }
+        self.result_cache.put(cache_key, results, persist=False)
+        return dict(results, data=shared_copy(df_grouped))
+        
+    def analyze_sql(self, df, query, should_stop=None):
+        """
+        Exécute une requête SQL (table « donnees ») sur les données, sans
+        prétraitement : le résultat est affiché tel que calculé par la base
+        """
+        if not is_select(query):
+            raise Exception(
+                "Seules les requêtes de lecture sont acceptées (SELECT ... FROM donnees, ou WITH ...)."
+            )
+
+        # La casse compte en SQL (valeurs littérales) : seuls les espaces sont normalisés
+        cache_key = self.result_cache.key('sql', df, query, fold=False)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, data=shared_copy(cached['data']))
+
+        with tracing.span('analyze_sql', rows=len(df)) as span:
+            with tracing.span('load'):
+                engine = sql_engine(df)
+            with tracing.span('query'):
+                result, truncated = engine.query(query, should_stop=should_stop)
+            span.set(result_rows=len(result), truncated=truncated)
+        if result.empty:
+            raise Exception("La requête SQL ne renvoie aucune ligne.")
+        results = {
+            'data': result,
+            'columns': list(result.columns),
+            'intent': {'type': 'sql', 'columns': list(result.columns), 'filters': []},
+            'chart_type': 'result',
+            'truncated': truncated,
+            'cache_key': cache_key
+        }
+        self.result_cache.put(cache_key, results, persist=False)
+        return dict(results, data=shared_copy(result))
         
     def _preprocess_data(self, df):
         """
         Prétraite les données : nettoyage, normalisation, etc.
+
+        Le résultat est calculé une seule fois par version des données et
+        partagé ensuite : chaque appel reçoit une vue (copie superficielle)
+        qu'il ne doit pas modifier en place.
         """
-        df_cleaned = df.copy()
-        
-        # Nettoyage de la colonne Âge : extraction du nombre
-        if 'Âge' in df_cleaned.columns:
-            df_cleaned['Âge'] = df_cleaned['Âge'].astype(str).str.extract(r'(\d+)').fillna(0).astype(int)
-        
-        # Nettoyage de la colonne Contact : garder le premier numéro
-        if 'Contact' in df_cleaned.columns:
-            df_cleaned['Contact'] = df_cleaned['Contact'].astype(str).str.split('/|,| ').str[0].str.replace(r'\D', '', regex=True)
-        
-        # Conversion en minuscules pour les colonnes textuelles
-        for col in df_cleaned.select_dtypes(include=['object']).columns:
-            df_cleaned[col] = df_cleaned[col].str.lower().fillna('')
-            # Limiter la longueur des textes pour l'analyse
-            df_cleaned[col] = df_cleaned[col].str.slice(0, 200)
-        
-        # Suppression des doublons
-        df_cleaned = df_cleaned.drop_duplicates()
+        version = data_version(df)
+        with self._preprocess_lock:
+            cleaned = self._preprocess_cache.get(version)
+            if cleaned is not None:
+                self._preprocess_cache.move_to_end(version)
+                return cleaned.copy(deep=False)
+
+        # Nettoyage hors du verrou : deux analyses simultanées des mêmes
+        # données peuvent le calculer chacune, la dernière est conservée
+        cleaned = self._clean_data(df)
+
+        with self._preprocess_lock:
+            self._preprocess_cache[version] = cleaned
+            while len(self._preprocess_cache) > self.PREPROCESS_CACHE_SIZE:
+                self._preprocess_cache.popitem(last=False)
+        return cleaned.copy(deep=False)
         
-        # Remplacement des valeurs manquantes par une chaîne vide ou 0
-        df_cleaned = df_cleaned.fillna('')
+    def _clean_data(self, df):
+        """
+        Nettoyage sans copie préalable : seules les colonnes modifiées sont recréées
+        """
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            
+            # Nettoyage de la colonne Âge : extraction du nombre
+            if col == 'Âge':
+                series = series.astype(str).str.extract(r'(\d+)', expand=False).fillna(0).astype(int)
+            
+            # Nettoyage de la colonne Contact : garder le premier numéro
+            elif col == 'Contact':
+                series = series.astype(str).str.split('/|,| ').str[0].str.replace(r'\D', '', regex=True)
+            
+            # Conversion en minuscules pour les colonnes textuelles
+            if is_text(series):
+                series = self._clean_text(series)
+            elif series.hasnans and not (
+                pd.api.types.is_datetime64_any_dtype(series)
+                or pd.api.types.is_timedelta64_dtype(series)
+            ):
+                # Remplacement des valeurs manquantes par une chaîne vide
+                # (les dates et durées gardent leur type et NaT, comme avec fillna(''))
+                series = series.astype(object).where(series.notna(), '')
+            columns[col] = series
+            
+        df_cleaned = pd.DataFrame(columns, index=df.index, copy=False)
         
+        # Suppression des doublons (seule copie complète, et seulement s'il y en a)
+        duplicated = df_cleaned.duplicated()
+        if duplicated.any():
+            df_cleaned = df_cleaned[~duplicated.to_numpy()]
+            
         return df_cleaned
         
+    def _clean_text(self, series):
+        """
+        Minuscules et troncature, calculées sur les seules valeurs distinctes
+        """
+        codes, uniques = pd.factorize(series)
+        cleaned = pd.Series(uniques, dtype=object).str.lower()
+        # Limiter la longueur des textes pour l'analyse ; non-textes et manquants -> ''
+        cleaned = cleaned.str.slice(0, 200).fillna('').to_numpy(dtype=object)
+        # Le code -1 (valeur manquante) désigne le '' ajouté en fin de tableau
+        cleaned = np.append(cleaned, '')
+        if series.dtype != object:
+            # Colonne compacte (category, chaînes Arrow) : le résultat reste une category
+            # (des valeurs distinctes peuvent se confondre une fois en minuscules)
+            labels, categories = pd.factorize(cleaned)
+            values = pd.Categorical.from_codes(labels[codes], categories=categories)
+        else:
+            values = cleaned[codes]
+        return pd.Series(values, index=series.index, name=series.name)
+        
     def _analyze_query(self, query):
         """
         Analyse la requête utilisateur pour comprendre l'intention
         """
-        tokens = word_tokenize(query.lower(), language='french')
-        tokens = [t for t in tokens if t not in self.stop_words]
-        
-        # Détection des mots-clés importants
-        keywords = {
-            'visualisation': ['montrer', 'afficher', 'voir', 'visualiser'],
-            'comparaison': ['comparer', 'différence', 'contre'],
-            'distribution': ['répartition', 'distribution', 'répartir'],
-            'tendance': ['évolution', 'tendance', 'progression']
-        }
+        return self._intent(parse_query(query))
         
-        intent = {
-            'type': 'visualisation',  # par défaut
+    def _intent(self, parsed):
+        """
+        Intention au format attendu par la visualisation (nouveau dict à chaque appel)
+        """
+        return {
+            'type': parsed.intent,
             'columns': [],
             'filters': []
         }
         
-        # Analyse des mots-clés
-        for token in tokens:
-            for intent_type, words in keywords.items():
-                if token in words:
-                    intent['type'] = intent_type
-                    
-        return intent
-        
     def _detect_column_from_query(self, df, query):
         """
         Détecte la colonne la plus pertinente à partir de la requête utilisateur
         """
-        query = query.lower()
-        best_col = None
-        best_score = 0
-        for col in df.columns:
-            col_clean = col.lower()
-            # Score de similarité simple (nombre de mots en commun)
-            score = sum(1 for mot in col_clean.split() if mot in query)
-            if score > best_score:
-                best_score = score
-                best_col = col
-        # On considère qu'il faut au moins 1 mot en commun
-        if best_score > 0:
-            return best_col
-        return None
+        # Il faut au moins un mot (éventuellement approché) du nom de la colonne dans la requête
+        matches = column_index(df.columns).lookup(query, limit=1)
+        return matches[0][0] if matches else None
         
     def _select_relevant_columns(self, df, query_intent):
         """
         Sélectionne les colonnes pertinentes pour l'analyse
         """
         # Analyse des types de données
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        numeric_cols = numeric_columns(df)
+        categorical_cols = text_columns(df)
         
         # Sélection des colonnes en fonction de l'intention
         if query_intent['type'] == 'visualisation':
@@ -224,27 +344,26 @@ class DataAnalyzer:
             
         return list(df.columns)
         
-    def _group_similar_data(self, df, columns):
+    def _group_similar_data(self, df, columns, progress=None):
         """
         Regroupe les données similaires en utilisant le clustering
         """
-        df_grouped = df.copy()
+        # Copie superficielle : les colonnes regroupées sont remplacées, pas modifiées
+        df_grouped = df.copy(deep=False)
         
-        # Pour chaque colonne catégorielle
-        for col in df_grouped.select_dtypes(include=['object']).columns:
-            # Vectorisation TF-IDF
-            vectorizer = TfidfVectorizer()
-            tfidf_matrix = vectorizer.fit_transform(df_grouped[col].fillna(''))
-            
-            # Clustering
-            n_clusters = min(5, len(df_grouped[col].unique()))
-            kmeans = KMeans(n_clusters=n_clusters)
-            clusters = kmeans.fit_predict(tfidf_matrix)
-            
-            # Remplacement par les valeurs les plus fréquentes dans chaque cluster
-            df_grouped[col] = df_grouped[col].map(
-                dict(zip(df_grouped[col].unique(), clusters))
-            )
+        # Seules les colonnes textuelles concernées par l'analyse sont regroupées
+        grouped_columns = [
+            col for col in text_columns(df_grouped)
+            if col in columns
+        ]
+        
+        def report(fraction, message=None):
+            if progress is not None:
+                progress(0.4 + 0.6 * fraction, message)
+        
+        groups = self.grouping_engine.group_columns(df_grouped, grouped_columns, progress=report)
+        for col, labels in groups.items():
+            df_grouped[col] = labels
             
         return df_grouped 
 
@@ -252,20 +371,4 @@ class DataAnalyzer:
         """
         Détecte le type de graphique demandé dans la requête utilisateur
         """
-        query = query.lower()
-        
-        # Mots-clés pour chaque type de graphique
-        chart_keywords = {
-            'pie': ["camembert", "cercle", "circulaire", "pie", "répartition", "pourcentage"],
-            'bar': ["barres", "histogramme", "bar", "colonnes", "fréquence", "nombre"],
-            'line': ["ligne", "line", "évolution", "tendance", "progression", "courbe"],
-            'scatter': ["nuage", "points", "scatter", "dispersion", "corrélation"],
-            'box': ["boîte", "box", "quartiles", "médiane", "distribution"]
-        }
-        
-        # Recherche des mots-clés dans la requête
-        for chart_type, keywords in chart_keywords.items():
-            if any(keyword in query for keyword in keywords):
-                return chart_type
-                
-        return None 
\ No newline at end of file
+        return parse_query(query).chart_type 
\ No newline at end of file
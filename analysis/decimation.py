@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def minmax_decimate(y, n_bins):
+    """
+    Indices des points min et max de chaque intervalle (un intervalle par pixel).
+
+    Conserve les pics et les creux : une courbe tracée avec ces seuls points
+    est visuellement identique à la courbe complète à cette résolution.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_bins = max(1, int(n_bins))
+    if n <= 2 * n_bins:
+        return np.arange(n)
+
+    size = -(-n // n_bins)
+    n_bins = -(-n // size)
+    padded = np.full(n_bins * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_bins, size)
+
+    # Les valeurs manquantes ne doivent être choisies ni comme min ni comme max
+    valid = np.isfinite(blocks)
+    low = np.where(valid, blocks, np.inf).argmin(axis=1)
+    high = np.where(valid, blocks, -np.inf).argmax(axis=1)
+
+    offsets = np.arange(n_bins) * size
+    indices = np.concatenate([offsets + low, offsets + high])
+    has_values = np.tile(valid.any(axis=1), 2)
+    return np.unique(indices[has_values])
+
+
+def lttb(x, y, n_out):
+    """
+    Indices retenus par l'algorithme Largest-Triangle-Three-Buckets
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Point moyen de l'intervalle suivant
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Point formant le plus grand triangle avec le précédent et ce point moyen
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = previous
+    return selected
@@ -0,0 +1,159 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    # Sans pyarrow, les textes de forte cardinalité restent de type object
+    STRING_DTYPE = None
+
+# Au-delà de cette proportion de valeurs distinctes, un texte n'est pas converti en category
+CATEGORY_MAX_RATIO = 0.5
+
+# Dates écrites en texte : 2024-01-31, 31/01/2024, 31.01.24 (heure éventuelle)
+_DATE_LIKE = re.compile(r'^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}(?:[ T]\d{1,2}:\d{2}(?::\d{2})?)?\s*$')
+_DATE_SAMPLE_SIZE = 1000
+
+
+def is_text(series):
+    """
+    Vrai pour une colonne textuelle, quel que soit son stockage (object, category, string)
+    """
+    dtype = series.dtype
+    return (
+        pd.api.types.is_object_dtype(dtype)
+        or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))
+        or (isinstance(dtype, pd.ArrowDtype) and pd.api.types.is_string_dtype(dtype))
+    )
+
+
+def is_numeric(series):
+    """
+    Vrai pour une colonne numérique (entiers et flottants de toute taille, hors booléens)
+    """
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def text_columns(df):
+    return [col for i, col in enumerate(df.columns) if is_text(df.iloc[:, i])]
+
+
+def numeric_columns(df):
+    return [col for i, col in enumerate(df.columns) if is_numeric(df.iloc[:, i])]
+
+
+class MemoryReport:
+    """
+    Mémoire d'un DataFrame avant et après optimize_dtypes, et conversions effectuées
+    """
+
+    def __init__(self, before, after, conversions):
+        self.before = before
+        self.after = after
+        self.conversions = conversions
+
+    @property
+    def saved(self):
+        return self.before - self.after
+
+    def to_dict(self):
+        return {
+            'before': self.before,
+            'after': self.after,
+            'conversions': {str(col): change for col, change in self.conversions.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['before'], data['after'], data.get('conversions', {}))
+
+    def __str__(self):
+        return f"{format_bytes(self.before)} → {format_bytes(self.after)}"
+
+
+def format_bytes(nbytes):
+    for unit in ('o', 'Ko', 'Mo'):
+        if nbytes < 1024:
+            return f"{nbytes:.0f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} Go"
+
+
+def optimize_dtypes(df):
+    """
+    Convertit les colonnes vers des types compacts ; renvoie (DataFrame, MemoryReport).
+
+    - texte peu varié -> category ; autre texte -> chaînes Arrow (si pyarrow est installé)
+    - texte ressemblant à des dates -> datetime64
+    - entiers et flottants -> plus petit type sans perte de valeur
+
+    Les colonnes non modifiées sont partagées avec `df`, qui n'est pas modifié.
+    """
+    columns = {}
+    conversions = {}
+    before = after = 0
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        size = int(series.memory_usage(index=False, deep=True))
+        optimized = _optimize_series(series)
+        before += size
+        if optimized is not series:
+            conversions[col] = (str(series.dtype), str(optimized.dtype))
+            size = int(optimized.memory_usage(index=False, deep=True))
+        after += size
+        columns[i] = optimized
+
+    result = pd.DataFrame(columns, index=df.index, copy=False)
+    result.columns = df.columns
+    return result, MemoryReport(before, after, conversions)
+
+
+def _optimize_series(series):
+    """
+    Version compacte d'une colonne, ou la colonne elle-même si rien n'est gagné
+    """
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return series
+    if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+        downcast = pd.to_numeric(series, downcast='integer')
+        return downcast if downcast.dtype != dtype else series
+    if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype) and dtype != np.float32:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        # Seulement si toutes les valeurs sont représentées exactement
+        if np.array_equal(narrowed.astype(dtype), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+    if pd.api.types.is_object_dtype(dtype):
+        return _optimize_text(series)
+    return series
+
+
+def _optimize_text(series):
+    values = series.dropna()
+    if len(values) == 0:
+        return series
+    # Colonnes mélangeant textes et nombres : laissées telles quelles
+    if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+        return series
+
+    if _looks_like_dates(values):
+        dates = pd.to_datetime(series, errors='coerce', dayfirst=True, format='mixed')
+        # Les valeurs non reconnues deviendraient NaT : conversion seulement sans perte
+        if dates.notna().sum() == len(values):
+            return dates
+
+    if values.nunique() <= CATEGORY_MAX_RATIO * len(values):
+        return series.astype('category')
+    if STRING_DTYPE is not None:
+        return series.astype(STRING_DTYPE)
+    return series
+
+
+def _looks_like_dates(values):
+    sample = values.iloc[:_DATE_SAMPLE_SIZE]
+    return bool(sample.str.match(_DATE_LIKE).all())
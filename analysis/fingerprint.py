@@ -0,0 +1,104 @@
+import hashlib
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+# Jetons de version attribués aux DataFrame, indexés par id() et liés à une
+# référence faible pour ne pas prolonger leur durée de vie
+_versions = {}
+_version_counter = itertools.count(1)
+# Réentrant : créer une référence faible sous ce verrou peut déclencher le
+# ramasse-miettes, qui appelle _forget (et reprend le verrou) dans le même thread
+_versions_lock = threading.RLock()
+
+# Empreintes de contenu déjà calculées, par version des données
+_fingerprints = OrderedDict()
+_fingerprints_lock = threading.Lock()
+_FINGERPRINT_CACHE_SIZE = 64
+
+
+def data_version(df):
+    """
+    Jeton identifiant une version d'un DataFrame, stable pendant toute sa durée de vie
+    (un DataFrame mis en cache sous ce jeton ne doit pas être modifié en place)
+    """
+    key = id(df)
+    with _versions_lock:
+        entry = _versions.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+        token = next(_version_counter)
+        ref = weakref.ref(df, lambda r, key=key: _forget(key, r))
+        _versions[key] = (ref, token)
+        return token
+
+
+def shared_copy(df):
+    """
+    Copie superficielle de df partageant sa version des données : les
+    résultats mis en cache pour l'une (profils, corrélations) servent à
+    l'autre. Ni df ni la copie ne doivent ensuite être modifiés en place.
+    """
+    copy = df.copy(deep=False)
+    token = data_version(df)
+    key = id(copy)
+    with _versions_lock:
+        ref = weakref.ref(copy, lambda r, key=key: _forget(key, r))
+        _versions[key] = (ref, token)
+    return copy
+
+
+def _forget(key, ref):
+    with _versions_lock:
+        entry = _versions.get(key)
+        if entry is not None and entry[0] is ref:
+            del _versions[key]
+
+
+def series_fingerprint(series, index=False):
+    """
+    Empreinte du contenu d'une Series (valeurs, et index si demandé)
+    """
+    hashes = pd.util.hash_pandas_object(series, index=index).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(str(series.dtype).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def dataframe_fingerprint(df):
+    """
+    Empreinte du contenu d'un DataFrame (valeurs, index, noms et types des colonnes)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    if len(df.columns):
+        hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        digest.update(hashes.tobytes())
+    else:
+        digest.update(str(len(df)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def data_fingerprint(df):
+    """
+    Empreinte du contenu d'un DataFrame, calculée une seule fois par version des données.
+
+    Contrairement à data_version, elle est identique pour deux DataFrame de
+    même contenu et d'une session à l'autre.
+    """
+    version = data_version(df)
+    with _fingerprints_lock:
+        if version in _fingerprints:
+            _fingerprints.move_to_end(version)
+            return _fingerprints[version]
+
+    fingerprint = dataframe_fingerprint(df)
+
+    with _fingerprints_lock:
+        _fingerprints[version] = fingerprint
+        while len(_fingerprints) > _FINGERPRINT_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+    return fingerprint
@@ -0,0 +1,118 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .import_cache import ImportCache
+from .text import slugify
+
+# État propre à chaque processus de rendu, initialisé une seule fois
+_worker = {}
+
+# Types de suggestion qui correspondent directement à un type de graphique
+_CHART_TYPES = ('pie', 'bar', 'line', 'scatter', 'box', 'correlation')
+
+
+def _init_worker(cache_dir, key):
+    """
+    Initialise un processus de rendu : backend Agg et données relues depuis le cache
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    from .data_analyzer import DataAnalyzer
+    from .visualization import Visualizer
+
+    df = ImportCache(cache_dir).load_frame(key)
+    if df is None:
+        raise RuntimeError(f"Données introuvables dans le cache : {key}")
+
+    _worker['df'] = df
+    _worker['analyzer'] = DataAnalyzer()
+    _worker['visualizer'] = Visualizer()
+
+
+def _suggestion_analysis(suggestion):
+    """
+    Analyse d'une suggestion, comme si sa description avait été saisie.
+
+    Les suggestions portant sur plusieurs colonnes ne nomment pas toujours
+    une colonne reconnue dans leur description : on utilise alors directement
+    leur type et leurs colonnes.
+    """
+    analyzer, df = _worker['analyzer'], _worker['df']
+    try:
+        return analyzer.analyze(df, suggestion['description'])
+    except Exception:
+        columns = list(suggestion['columns'])
+        return {
+            'data': analyzer._preprocess_data(df),
+            'columns': columns,
+            'intent': {'type': suggestion['type'], 'columns': columns, 'filters': []},
+            'chart_type': suggestion['type'] if suggestion['type'] in _CHART_TYPES else None
+        }
+
+
+def _render_one(index, suggestion, out_dir, formats):
+    """
+    Rend une suggestion dans chacun des formats demandés
+    """
+    start = time.perf_counter()
+    result = {'index': index, 'title': suggestion['title'], 'files': [], 'error': None}
+    try:
+        analysis = _suggestion_analysis(suggestion)
+        base = os.path.join(out_dir, f"{index:03d}_{slugify(suggestion['title'])}")
+        for fmt in formats:
+            path = f"{base}.{fmt}"
+            _worker['visualizer'].render_to_file(
+                analysis['data'],
+                analysis,
+                path,
+                chart_type=analysis.get('chart_type')
+            )
+            result['files'].append(path)
+    except Exception as e:
+        # Une suggestion en échec n'interrompt pas le lot
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def render_suggestions(df, out_dir, suggestions=None, formats=('png',), max_workers=None, cache=None):
+    """
+    Rend toutes les suggestions d'un DataFrame en images, sans affichage.
+
+    Le DataFrame est écrit une fois dans le cache d'import puis rouvert par
+    chaque processus (colonnes numériques en mémoire mappée) au lieu d'être
+    sérialisé pour chaque tâche. Renvoie un résultat par suggestion, dans
+    l'ordre : titre, fichiers produits, erreur éventuelle et durée.
+    """
+    cache = cache or ImportCache()
+    if suggestions is None:
+        from .data_analyzer import DataAnalyzer
+        suggestions = DataAnalyzer().get_suggestions(df)
+    if not suggestions:
+        return []
+
+    os.makedirs(out_dir, exist_ok=True)
+    key = cache.store_frame(df)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(cache.cache_dir, key)
+    ) as executor:
+        futures = [
+            executor.submit(_render_one, i, suggestion, out_dir, tuple(formats))
+            for i, suggestion in enumerate(suggestions, start=1)
+        ]
+        return [future.result() for future in futures]
+
+
+def render_workbook(file_path, out_dir, sheet_name=0, **kwargs):
+    """
+    Rend les suggestions d'un classeur Excel dans out_dir/<nom du classeur>/
+    """
+    cache = kwargs.pop('cache', None) or ImportCache()
+    df = cache.read_excel(file_path, sheet_name=sheet_name, optimize=True)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    return render_suggestions(df, os.path.join(out_dir, name), cache=cache, **kwargs)
@@ -0,0 +1,314 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import optimize_dtypes
+from .fingerprint import dataframe_fingerprint
+
+
+class ImportCache:
+    """
+    Cache disque des classeurs importés.
+
+    Chaque feuille lue est enregistrée colonne par colonne au format `.npy`
+    dans un dossier identifié par le hash du contenu du fichier, sa date de
+    modification et le nom de la feuille. Les colonnes numériques et dates
+    sont ensuite rouvertes en mémoire mappée, ce qui évite de relancer le
+    parsing openpyxl lors des imports suivants.
+    """
+
+    MANIFEST = 'manifest.json'
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".data_analyste", "import_cache")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Hash du contenu mémorisé par (chemin, taille, date) pour ne pas relire le fichier
+        self._hash_memo = {}
+
+    def read_excel(self, file_path, sheet_name=0, optimize=False, **kwargs):
+        """
+        Équivalent de pd.read_excel passant par le cache
+
+        Avec optimize=True, la feuille est convertie en types compacts
+        (voir optimize_dtypes) avant d'être mise en cache, et le bilan mémoire
+        est conservé dans le manifeste (voir memory_report).
+        """
+        df = self.load(file_path, sheet_name, optimize=optimize)
+        if df is None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, **kwargs)
+            metadata = {}
+            if optimize:
+                df, report = optimize_dtypes(df)
+                metadata['memory'] = report.to_dict()
+            self.store(file_path, df, sheet_name, optimize=optimize, **metadata)
+        return df
+
+    def load(self, file_path, sheet_name=0, optimize=False):
+        """
+        Renvoie la feuille en cache ou None si elle n'a jamais été importée
+        """
+        return self.load_frame(self._entry_key(file_path, sheet_name, optimize))
+
+    def store(self, file_path, df, sheet_name=0, optimize=False, **metadata):
+        """
+        Enregistre une feuille dans le cache puis applique la limite de taille
+        """
+        self._store_entry(
+            self._entry_key(file_path, sheet_name, optimize),
+            df,
+            source=os.path.abspath(file_path),
+            sheet=str(sheet_name),
+            **metadata
+        )
+
+    def memory_report(self, file_path, sheet_name=0):
+        """
+        Bilan mémoire (dict de MemoryReport.to_dict) d'une feuille importée avec optimize=True
+        """
+        entry_dir = os.path.join(self.cache_dir, self._entry_key(file_path, sheet_name, True))
+        try:
+            with open(os.path.join(entry_dir, self.MANIFEST), 'r', encoding='utf-8') as f:
+                return json.load(f).get('memory')
+        except (OSError, ValueError):
+            return None
+
+    def store_frame(self, df, key=None):
+        """
+        Enregistre un DataFrame quelconque et renvoie sa clé (par défaut, l'empreinte de son contenu).
+
+        Permet de partager des données entre processus : chacun les rouvre avec
+        load_frame, en mémoire mappée, au lieu de les recevoir sérialisées.
+        """
+        if key is None:
+            key = dataframe_fingerprint(df)
+        entry_dir = os.path.join(self.cache_dir, key)
+        if not os.path.exists(os.path.join(entry_dir, self.MANIFEST)):
+            self._store_entry(key, df)
+        return key
+
+    def load_frame(self, key):
+        """
+        Relit une entrée du cache par sa clé, ou None si elle est absente
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        manifest_path = os.path.join(entry_dir, self.MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != self.FORMAT_VERSION:
+                return None
+            df = self._read_entry(entry_dir, manifest)
+        except (OSError, ValueError, KeyError):
+            # Entrée absente ou corrompue : on relira le fichier Excel
+            return None
+
+        # La date de modification du manifeste sert d'horodatage LRU
+        try:
+            os.utime(manifest_path)
+        except OSError:
+            pass
+        return df
+
+    def _store_entry(self, key, df, **metadata):
+        """
+        Écrit une entrée de façon atomique (dossier temporaire puis renommage)
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            manifest = self._write_entry(tmp_dir, df)
+            manifest.update(metadata)
+            with open(os.path.join(tmp_dir, self.MANIFEST), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Le cache est une optimisation : un échec d'écriture n'est pas bloquant
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def invalidate(self, file_path=None):
+        """
+        Supprime les entrées d'un fichier, ou tout le cache si aucun fichier n'est donné
+        """
+        if file_path is None:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._hash_memo.clear()
+            return
+
+        source = os.path.abspath(file_path)
+        for entry_dir, manifest in self._entries():
+            if manifest.get('source') == source:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+        self._hash_memo = {k: v for k, v in self._hash_memo.items() if k[0] != source}
+
+    def size(self):
+        """
+        Taille totale du cache en octets
+        """
+        return sum(manifest.get('nbytes', 0) for _, manifest in self._entries())
+
+    def _entry_key(self, file_path, sheet_name, optimize=False):
+        """
+        Clé d'une entrée : hash du contenu, date de modification, feuille et types compacts ou non
+        """
+        stat = os.stat(file_path)
+        content_hash = self._content_hash(file_path, stat)
+        key = f"{content_hash}|{stat.st_mtime_ns}|{sheet_name}"
+        if optimize:
+            key += "|compact"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _content_hash(self, file_path, stat):
+        """
+        Hash SHA-1 du contenu du fichier, mémorisé tant que le fichier ne change pas
+        """
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._hash_memo:
+            digest = hashlib.sha1()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            self._hash_memo[memo_key] = digest.hexdigest()
+        return self._hash_memo[memo_key]
+
+    def _write_entry(self, entry_dir, df):
+        """
+        Écrit chaque colonne dans son propre fichier .npy
+        """
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            file_name = f"col_{i:05d}.npy"
+            path = os.path.join(entry_dir, file_name)
+            info = {'file': file_name, 'dtype': _dtype_name(series.dtype)}
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+                # Colonne native : relue en mémoire mappée
+                np.save(path, series.to_numpy(), allow_pickle=False)
+                info['mmap'] = True
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                # Catégories : codes en mémoire mappée, libellés à part
+                np.save(path, series.cat.codes.to_numpy(), allow_pickle=False)
+                info['categories'] = f"col_{i:05d}_categories.npy"
+                info['ordered'] = bool(series.cat.ordered)
+                np.save(
+                    os.path.join(entry_dir, info['categories']),
+                    series.cat.categories.to_numpy(dtype=object),
+                    allow_pickle=True
+                )
+                info['mmap'] = True
+            else:
+                np.save(path, series.to_numpy(dtype=object), allow_pickle=True)
+                info['mmap'] = False
+            columns.append(info)
+
+        # Les noms de colonnes et l'index peuvent ne pas être des chaînes
+        names = np.empty(len(df.columns), dtype=object)
+        for i, col in enumerate(df.columns):
+            names[i] = col
+        np.save(os.path.join(entry_dir, 'columns.npy'), names, allow_pickle=True)
+        has_index = not isinstance(df.index, pd.RangeIndex)
+        if has_index:
+            np.save(os.path.join(entry_dir, 'index.npy'), df.index.to_numpy(dtype=object), allow_pickle=True)
+
+        nbytes = sum(
+            os.path.getsize(os.path.join(entry_dir, name)) for name in os.listdir(entry_dir)
+        )
+        return {
+            'version': self.FORMAT_VERSION,
+            'n_rows': len(df),
+            'columns': columns,
+            'has_index': has_index,
+            'nbytes': nbytes,
+            'created': time.time()
+        }
+
+    def _read_entry(self, entry_dir, manifest):
+        """
+        Reconstruit le DataFrame à partir des fichiers .npy sans copier les colonnes mappées
+        """
+        names = np.load(os.path.join(entry_dir, 'columns.npy'), allow_pickle=True).tolist()
+        data = {}
+        for i, info in enumerate(manifest['columns']):
+            path = os.path.join(entry_dir, info['file'])
+            if 'categories' in info:
+                categories = np.load(os.path.join(entry_dir, info['categories']), allow_pickle=True)
+                values = pd.Categorical.from_codes(
+                    np.load(path, mmap_mode='r'),
+                    categories=categories,
+                    ordered=info['ordered']
+                )
+            elif info['mmap']:
+                values = np.load(path, mmap_mode='r')
+            else:
+                values = np.load(path, allow_pickle=True)
+                if info['dtype'] != 'object':
+                    values = pd.Series(values, copy=False).astype(info['dtype']).array
+            data[i] = values
+
+        if manifest['has_index']:
+            index = pd.Index(np.load(os.path.join(entry_dir, 'index.npy'), allow_pickle=True))
+        else:
+            index = pd.RangeIndex(manifest['n_rows'])
+
+        df = pd.DataFrame(data, index=index, copy=False)
+        df.columns = pd.Index(names, dtype=object)
+        return df
+
+    def _entries(self):
+        """
+        Liste les entrées valides du cache avec leur manifeste
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            try:
+                with open(os.path.join(entry_dir, self.MANIFEST), 'r', encoding='utf-8') as f:
+                    entries.append((entry_dir, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées au-delà de max_bytes
+        """
+        entries = []
+        for entry_dir, manifest in self._entries():
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_dir, self.MANIFEST))
+            except OSError:
+                continue
+            entries.append((last_used, entry_dir, manifest.get('nbytes', 0)))
+
+        total = sum(nbytes for _, _, nbytes in entries)
+        for _, entry_dir, nbytes in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= nbytes
+
+
+def _dtype_name(dtype):
+    """
+    Nom de type relu par astype à l'identique (y compris le stockage des chaînes)
+    """
+    if isinstance(dtype, pd.StringDtype):
+        return f"string[{dtype.storage}]"
+    return str(dtype)
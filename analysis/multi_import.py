@@ -0,0 +1,207 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from . import tracing
+from .dtypes import MemoryReport, is_numeric, is_text
+from .import_cache import ImportCache
+
+# Colonne ajoutée pour indiquer le fichier d'origine de chaque ligne
+SOURCE_COLUMN = 'Fichier source'
+
+
+def read_files(file_paths, sheet_name=0, cache=None, max_workers=None, progress=None,
+               source_column=SOURCE_COLUMN):
+    """
+    Lit plusieurs classeurs de même structure et les réunit en un seul
+    DataFrame ; renvoie (DataFrame, MemoryReport).
+
+    Les fichiers déjà présents dans le cache d'import sont relus depuis
+    celui-ci ; les autres sont parsés en parallèle, un processus par
+    fichier, et mis en cache au passage. Les colonnes sont réunies
+    (voir unify_frames) et `source_column` indique le fichier de chaque ligne.
+
+    `progress(fraction, message)` est appelé après chaque fichier ; il peut
+    lever une exception pour interrompre la lecture.
+    """
+    if progress is None:
+        progress = lambda fraction, message=None: None
+    if not file_paths:
+        raise ValueError("Aucun fichier à importer")
+    cache = cache or ImportCache()
+    total = len(file_paths)
+
+    with tracing.span('read_files', files=total):
+        frames = {}
+        for path in file_paths:
+            df = cache.load(path, sheet_name, optimize=True)
+            if df is not None:
+                frames[path] = df
+        progress(len(frames) / (total + 1), f"{len(frames)}/{total} fichiers lus depuis le cache")
+
+        missing = [path for path in file_paths if path not in frames]
+        done = len(frames)
+
+        def report(path):
+            nonlocal done
+            done += 1
+            progress(done / (total + 1), f"{done}/{total} fichiers lus ({os.path.basename(path)})")
+
+        if len(missing) > 1:
+            _parse_in_pool(missing, sheet_name, cache.cache_dir, max_workers, report)
+        for path in missing:
+            # Relu depuis le cache que les processus viennent de remplir (ou parsé ici)
+            frames[path] = cache.read_excel(path, sheet_name=sheet_name, optimize=True)
+            if len(missing) == 1:
+                report(path)
+
+        progress(total / (total + 1), "Réunion des fichiers...")
+        with tracing.span('unify'):
+            df = unify_frames(
+                [frames[path] for path in file_paths],
+                _source_names(file_paths),
+                source_column=source_column
+            )
+
+    before = 0
+    conversions = {}
+    for path in file_paths:
+        report = cache.memory_report(path, sheet_name)
+        if report is None:
+            before += int(frames[path].memory_usage(deep=True).sum())
+        else:
+            before += report['before']
+            for col, change in report.get('conversions', {}).items():
+                conversions.setdefault(col, change)
+    after = int(df.memory_usage(index=False, deep=True).sum())
+    return df, MemoryReport(before, after, conversions)
+
+
+def _parse_file(cache_dir, file_path, sheet_name):
+    """
+    Parse un classeur dans un processus et l'enregistre dans le cache d'import
+    """
+    ImportCache(cache_dir).read_excel(file_path, sheet_name=sheet_name, optimize=True)
+    return file_path
+
+
+def _parse_in_pool(file_paths, sheet_name, cache_dir, max_workers, on_done):
+    """
+    Parse les fichiers en parallèle ; seul le cache disque est partagé avec
+    les processus, les DataFrame ne sont pas renvoyés sérialisés
+    """
+    if max_workers is None:
+        max_workers = min(len(file_paths), os.cpu_count() or 1)
+    # spawn : l'appelant peut être un thread de l'interface (fork y est risqué)
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+    try:
+        futures = [executor.submit(_parse_file, cache_dir, path, sheet_name) for path in file_paths]
+        for future in as_completed(futures):
+            on_done(future.result())
+    except BaseException:
+        # Annulation ou erreur : les fichiers pas encore commencés ne sont pas lus
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
+def _source_names(file_paths):
+    """
+    Nom de chaque fichier (le chemin complet si plusieurs fichiers portent le même nom)
+    """
+    names = [os.path.basename(path) for path in file_paths]
+    if len(set(names)) < len(names):
+        names = [os.path.abspath(path) for path in file_paths]
+    return names
+
+
+def unify_frames(frames, sources=None, source_column=SOURCE_COLUMN):
+    """
+    Concatène des DataFrame aux colonnes partiellement différentes.
+
+    Les colonnes sont l'union de celles des DataFrame, dans l'ordre de
+    première apparition ; une colonne absente d'un fichier y vaut NaN.
+    Chaque colonne reçoit un type commun (voir _unified_dtype) puis est
+    assemblée en une seule copie, sans passer par un DataFrame intermédiaire.
+
+    Si `sources` est donné (un nom par DataFrame), la colonne `source_column`
+    (catégorielle) indique l'origine de chaque ligne.
+    """
+    lengths = [len(frame) for frame in frames]
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+
+    result = {}
+    for col in columns:
+        present = [frame[col] if col in frame.columns else None for frame in frames]
+        dtype = _unified_dtype(
+            [series.dtype for series in present if series is not None],
+            missing=any(series is None for series in present)
+        )
+        pieces = [
+            _missing(length, dtype) if series is None else series.astype(dtype, copy=False)
+            for series, length in zip(present, lengths)
+        ]
+        result[col] = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].reset_index(drop=True)
+
+    if sources is not None:
+        name, i = source_column, 1
+        while name in result:
+            i += 1
+            name = f"{source_column} ({i})"
+        result[name] = pd.Categorical.from_codes(
+            np.repeat(np.arange(len(frames)), lengths),
+            categories=pd.Index(sources)
+        )
+
+    return pd.DataFrame(result, index=pd.RangeIndex(sum(lengths)), copy=False)
+
+
+def _unified_dtype(dtypes, missing=False):
+    """
+    Type commun de plusieurs versions d'une même colonne
+
+    - catégories -> catégorie réunissant toutes les valeurs
+    - nombres -> type numpy le plus petit qui les contient tous (flottant
+      s'il faut représenter des valeurs manquantes)
+    - dates -> datetime64 de la résolution la plus fine
+    - textes de stockages différents -> chaînes si l'un des fichiers en
+      utilise, sinon object ; mélange de textes et de nombres -> object
+    """
+    first = dtypes[0]
+    if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+        categories = first.categories
+        for dtype in dtypes[1:]:
+            categories = categories.append(dtype.categories)
+        return pd.CategoricalDtype(categories.unique())
+
+    samples = [pd.Series([], dtype=dtype) for dtype in dtypes]
+    if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+        if all(is_numeric(sample) for sample in samples):
+            dtype = np.result_type(*dtypes)
+            # Entiers et valeurs manquantes : flottant assez large pour les entiers
+            return np.promote_types(dtype, np.float32) if missing and dtype.kind in 'iu' else dtype
+        if all(dtype.kind == 'M' for dtype in dtypes):
+            return np.result_type(*dtypes)
+        if all(dtype.kind == 'b' for dtype in dtypes):
+            return pd.BooleanDtype() if missing else first
+
+    if all(dtype == first for dtype in dtypes):
+        return first
+    if all(is_text(sample) for sample in samples):
+        for dtype in dtypes:
+            if isinstance(dtype, pd.StringDtype):
+                return dtype
+    return np.dtype(object)
+
+
+def _missing(length, dtype):
+    """
+    Colonne de `length` valeurs manquantes du type `dtype`
+    """
+    return pd.Series(np.full(length, np.nan, dtype=object)).astype(dtype)
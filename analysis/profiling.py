@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import is_numeric
+from .fingerprint import data_version
+
+
+class ColumnProfile:
+    """
+    Résumé d'une colonne : type, valeurs manquantes, nombre de valeurs
+    distinctes, valeurs les plus fréquentes et, pour les colonnes
+    numériques, bornes, quantiles et histogramme (valeurs exactes)
+    """
+
+    QUANTILES = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0)
+
+    def __init__(self, name, dtype, count, null_count, distinct_count, top_values,
+                 minimum=None, maximum=None, mean=None, quantiles=None, histogram=None):
+        self.name = name
+        self.dtype = dtype
+        self.count = count
+        self.null_count = null_count
+        self.distinct_count = distinct_count
+        self.top_values = top_values
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.quantiles = quantiles or {}
+        self.histogram = histogram
+
+    @classmethod
+    def from_series(cls, series, top_k=20, bins=20):
+        """
+        Calcule le profil d'une colonne
+        """
+        null_count = int(series.isna().sum())
+        # Un seul comptage donne à la fois les valeurs distinctes et les plus fréquentes
+        counts = series.value_counts()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Les catégories absentes (comptées 0) ne sont pas des valeurs de la colonne
+            counts = counts[counts > 0]
+            counts.index = counts.index.astype(object)
+        top_values = counts.head(top_k)
+
+        profile = cls(
+            name=series.name,
+            dtype=series.dtype,
+            count=len(series),
+            null_count=null_count,
+            distinct_count=len(counts),
+            top_values=top_values
+        )
+
+        if is_numeric(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[np.isfinite(values)]
+            if len(values):
+                quantiles = np.quantile(values, cls.QUANTILES)
+                profile.minimum = float(quantiles[0])
+                profile.maximum = float(quantiles[-1])
+                profile.mean = float(values.mean())
+                profile.quantiles = dict(zip(cls.QUANTILES, quantiles.tolist()))
+                profile.histogram = np.histogram(values, bins=bins)
+        return profile
+
+    @property
+    def is_numeric(self):
+        return self.histogram is not None
+
+    def top(self, n=10):
+        """
+        Équivalent de value_counts().head(n)
+        """
+        return self.top_values.head(n)
+
+    def box_stats(self, label=None):
+        """
+        Statistiques au format attendu par Axes.bxp (moustaches de Tukey bornées par min/max)
+        """
+        if not self.is_numeric:
+            return None
+        q1, median, q3 = self.quantiles[0.25], self.quantiles[0.5], self.quantiles[0.75]
+        iqr = q3 - q1
+        return {
+            'label': self.name if label is None else label,
+            'q1': q1,
+            'med': median,
+            'q3': q3,
+            'whislo': max(self.minimum, q1 - 1.5 * iqr),
+            'whishi': min(self.maximum, q3 + 1.5 * iqr),
+            'mean': self.mean,
+            'fliers': []
+        }
+
+
+# Profils déjà calculés : version des données -> {colonne: ColumnProfile}
+# (borné en nombre de versions : toutes les colonnes d'une feuille large restent en cache)
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+_PROFILE_CACHE_SIZE = 8
+
+
+def column_profile(df, column):
+    """
+    Profil d'une colonne, calculé une seule fois par version des données
+
+    Les résultats d'analyse partagent la version de leurs données d'une
+    requête à l'autre (voir fingerprint.shared_copy) : un graphique réaffiché
+    réutilise les profils déjà calculés.
+    """
+    version = data_version(df)
+    with _profiles_lock:
+        profiles = _profiles.get(version)
+        if profiles is not None:
+            _profiles.move_to_end(version)
+            if column in profiles:
+                return profiles[column]
+
+    profile = ColumnProfile.from_series(df[column])
+
+    with _profiles_lock:
+        _profiles.setdefault(version, {})[column] = profile
+        _profiles.move_to_end(version)
+        while len(_profiles) > _PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def profile_dataframe(df):
+    """
+    Profils de toutes les colonnes (appelé à l'import)
+    """
+    return {col: column_profile(df, col) for col in df.columns}
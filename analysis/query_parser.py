@@ -0,0 +1,135 @@
+from collections import deque, namedtuple
+from functools import lru_cache
+
+from .text import fold_text
+
+# Mots-clés d'intention : reconnus comme mots entiers ; le dernier de la requête l'emporte
+INTENT_KEYWORDS = {
+    'visualisation': ['montrer', 'afficher', 'voir', 'visualiser'],
+    'comparaison': ['comparer', 'différence', 'contre'],
+    'distribution': ['répartition', 'distribution', 'répartir'],
+    'tendance': ['évolution', 'tendance', 'progression']
+}
+
+# Mots-clés de graphique : reconnus n'importe où dans la requête, par ordre de priorité
+CHART_KEYWORDS = {
+    'pie': ["camembert", "cercle", "circulaire", "pie", "répartition", "pourcentage"],
+    'bar': ["barres", "histogramme", "bar", "colonnes", "fréquence", "nombre"],
+    'line': ["ligne", "line", "évolution", "tendance", "progression", "courbe"],
+    'scatter': ["nuage", "points", "scatter", "dispersion", "corrélation"],
+    'box': ["boîte", "box", "quartiles", "médiane", "distribution"]
+}
+
+DEFAULT_INTENT = 'visualisation'
+
+ParsedQuery = namedtuple('ParsedQuery', ['intent', 'chart_type'])
+ParsedQuery.__doc__ = """
+Résultat de parse_query : intention et type de graphique (ou None) ; les
+colonnes citées sont résolues par l'index des noms de colonnes (voir column_index)
+"""
+
+
+class KeywordAutomaton:
+    """
+    Automate d'Aho-Corasick : trouve toutes les occurrences (y compris
+    chevauchantes) d'un ensemble de mots en une seule lecture du texte
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+    def add(self, word, payload):
+        """
+        Ajoute un mot ; `payload` est renvoyé avec chacune de ses occurrences
+        """
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(word), payload))
+
+    def build(self):
+        """
+        Calcule les liens d'échec ; à appeler une fois tous les mots ajoutés
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        return self
+
+    def find(self, text):
+        """
+        Renvoie les occurrences (début, fin, payload) dans l'ordre de leur fin
+        """
+        matches = []
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, payload in self._output[state]:
+                matches.append((end - length, end, payload))
+        return matches
+
+
+@lru_cache(maxsize=1)
+def _automaton():
+    """
+    Automate des mots-clés d'intention et de graphique, construit une seule fois
+    """
+    automaton = KeywordAutomaton()
+    for intent, words in INTENT_KEYWORDS.items():
+        for word in words:
+            automaton.add(fold_text(word), ('intent', intent))
+    for priority, (chart_type, words) in enumerate(CHART_KEYWORDS.items()):
+        for word in words:
+            automaton.add(fold_text(word), ('chart', priority))
+    return automaton.build()
+
+
+def _is_word(text, start, end):
+    """
+    Vrai si text[start:end] n'est pas collé à d'autres lettres ou chiffres
+    """
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+@lru_cache(maxsize=1024)
+def _parse(folded_query):
+    intent_position, intent = -1, DEFAULT_INTENT
+    chart_priority = None
+
+    for start, end, (kind, value) in _automaton().find(folded_query):
+        if kind == 'intent':
+            if start > intent_position and _is_word(folded_query, start, end):
+                intent_position, intent = start, value
+        elif chart_priority is None or value < chart_priority:
+            chart_priority = value
+
+    chart_type = list(CHART_KEYWORDS)[chart_priority] if chart_priority is not None else None
+    return ParsedQuery(intent, chart_type)
+
+
+def parse_query(query):
+    """
+    Analyse une requête en une seule lecture : intention et type de graphique
+    (insensible à la casse et aux accents).
+
+    Les résultats sont mémorisés par requête normalisée.
+    """
+    return _parse(' '.join(fold_text(query).split()))
@@ -0,0 +1,234 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .fingerprint import data_fingerprint
+from .text import fold_text
+
+
+def normalize_query(query, fold=True):
+    """
+    Requête ramenée à une forme canonique (espaces, et casse et accents si `fold`)
+    """
+    if fold:
+        query = fold_text(query)
+    return ' '.join(query.split())
+
+
+# Lignes échantillonnées pour estimer la taille des colonnes object (textes)
+_SIZE_SAMPLE_ROWS = 1000
+
+
+def estimate_size(value):
+    """
+    Taille approximative en mémoire d'un résultat (DataFrame, tableaux, dict...)
+
+    Les tableaux sont mesurés par leur nbytes ; seules les colonnes object
+    sont estimées, sur un échantillon, au lieu d'un parcours complet
+    (memory_usage(deep=True)).
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.index.nbytes) + sum(
+            _series_size(value.iloc[:, i]) for i in range(value.shape[1])
+        )
+    if isinstance(value, pd.Series):
+        return int(value.index.nbytes) + _series_size(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _series_size(series):
+    size = int(series.memory_usage(index=False, deep=False))
+    if series.dtype == object and len(series):
+        sample = series.iloc[:_SIZE_SAMPLE_ROWS]
+        per_row = (sample.memory_usage(index=False, deep=True) - sample.memory_usage(index=False)) / len(sample)
+        size += int(per_row * len(series))
+    return size
+
+
+class ResultCache:
+    """
+    Cache LRU des résultats coûteux (analyses, suggestions, images des graphiques).
+
+    Les clés sont construites à partir de l'empreinte du contenu des données
+    et de la requête normalisée (voir key) : un autre fichier de même
+    structure ne partage jamais les résultats d'un autre. La mémoire occupée
+    est bornée par `max_bytes` ; au-delà, les entrées les moins récemment
+    utilisées sont libérées.
+
+    Avec persist=True, les entrées d'au plus `max_disk_entry_bytes` sont aussi
+    écrites dans `cache_dir` et relues lors des sessions suivantes (dossier
+    borné à `max_disk_bytes`, les fichiers les moins récemment utilisés étant
+    supprimés en premier), sauf celles mises en cache avec persist=False
+    (tableaux de résultats, rapides à recalculer comparés à leur écriture).
+    Un dossier inaccessible ne fait que désactiver l'écriture.
+    """
+
+    # 2 : les tableaux de résultats d'analyse ne sont plus écrits sur disque
+    FORMAT_VERSION = 2
+
+    def __init__(self, max_bytes=256 * 1024 ** 2, cache_dir=None, persist=False,
+                 max_disk_bytes=1024 ** 3, max_disk_entry_bytes=32 * 1024 ** 2):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".data_analyste", "result_cache")
+        self.cache_dir = cache_dir
+        self.persist = persist
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_entry_bytes = max_disk_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def key(self, kind, df, query='', *extra, fold=True):
+        """
+        Clé d'un résultat : type de résultat, contenu des données, requête normalisée et paramètres
+        """
+        parts = (self.FORMAT_VERSION, kind, data_fingerprint(df), normalize_query(query, fold), extra)
+        return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+    def derived_key(self, key, *extra):
+        """
+        Clé d'un résultat dérivé d'un autre (par exemple l'image d'une analyse)
+        """
+        return hashlib.blake2b(repr((key, extra)).encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key):
+        """
+        Résultat mis en cache, ou None
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        value = self._read(key) if self.persist else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._insert(key, value, estimate_size(value))
+        return value
+
+    def put(self, key, value, nbytes=None, persist=True):
+        """
+        Met un résultat en cache (ignoré s'il dépasse à lui seul le budget mémoire) ;
+        avec persist=False, il n'est conservé qu'en mémoire
+        """
+        nbytes = estimate_size(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return
+        self._insert(key, value, nbytes)
+        if persist and self.persist and nbytes <= self.max_disk_entry_bytes:
+            self._write(key, value)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+    def _insert(self, key, value, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries[key][1]
+            self._entries[key] = (value, nbytes)
+            self._entries.move_to_end(key)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            # Date d'accès pour l'éviction LRU du dossier
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Fichier tronqué ou d'une version incompatible : ignoré
+            return None
+
+    def _write(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            # Dossier inaccessible, résultat non sérialisable ou disque plein :
+            # il reste en mémoire seulement
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total -= size
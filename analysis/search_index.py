@@ -0,0 +1,220 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .text import fold_series, fold_text
+
+
+class SearchIndex:
+    """
+    Index de recherche plein texte construit une fois par import.
+
+    Chaque colonne est factorisée : on ne travaille que sur ses valeurs
+    distinctes, normalisées (minuscules, sans accents). Un index de trigrammes
+    associe chaque trigramme aux valeurs qui le contiennent, et chaque valeur
+    renvoie aux lignes où elle apparaît. Une recherche de sous-chaîne ne
+    vérifie donc que les valeurs candidates au lieu de parcourir tout le tableau.
+
+    Les derniers résultats sont conservés (LRU terme -> lignes) : un terme qui
+    prolonge un terme déjà cherché ne filtre que les lignes de ce dernier, et
+    revenir en arrière (effacement) est immédiat.
+    """
+
+    def __init__(self, df=None, max_refinements=32):
+        self.max_refinements = max_refinements
+        self._refinements = OrderedDict()
+        self._lock = threading.Lock()
+        self.n_rows = 0
+        self._vocabulary = pd.Series([], dtype=object)
+        self._value_column = np.empty(0, dtype=np.int32)
+        self._value_local = np.empty(0, dtype=np.int64)
+        self._columns = []
+        self._trigrams = np.empty(0, dtype=np.uint64)
+        self._trigram_starts = np.zeros(1, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int64)
+        if df is not None:
+            self.build(df)
+
+    def build(self, df):
+        """
+        (Re)construit l'index à partir du DataFrame ; à rappeler si les données changent
+        """
+        self.n_rows = len(df)
+        self._columns = []
+        with self._lock:
+            self._refinements.clear()
+        vocabulary, value_column, value_local = [], [], []
+
+        for i in range(df.shape[1]):
+            codes, uniques = pd.factorize(df.iloc[:, i])
+            # Lignes regroupées par valeur : les lignes de la valeur k sont
+            # rows[starts[k]:starts[k + 1]]
+            rows = np.argsort(codes, kind='stable')
+            starts = np.searchsorted(codes[rows], np.arange(len(uniques) + 1))
+            offset = sum(len(v) for v in vocabulary)
+            self._columns.append((codes, rows, starts, offset))
+
+            vocabulary.append(fold_series(pd.Series(uniques, dtype=object)).str.replace('\x00', '', regex=False))
+            value_column.append(np.full(len(uniques), i, dtype=np.int32))
+            value_local.append(np.arange(len(uniques)))
+
+        if vocabulary:
+            self._vocabulary = pd.concat(vocabulary, ignore_index=True)
+            self._value_column = np.concatenate(value_column)
+            self._value_local = np.concatenate(value_local)
+        else:
+            self._vocabulary = pd.Series([], dtype=object)
+            self._value_column = np.empty(0, dtype=np.int32)
+            self._value_local = np.empty(0, dtype=np.int64)
+        self._build_trigrams()
+
+    def search(self, term):
+        """
+        Renvoie les positions (triées) des lignes dont une cellule contient `term`
+        """
+        term = fold_text(term)
+        if not term:
+            return np.empty(0, dtype=np.int64)
+
+        with self._lock:
+            if term in self._refinements:
+                self._refinements.move_to_end(term)
+                return self._refinements[term]
+            # Un terme contenu dans `term` donne un sur-ensemble des résultats :
+            # on repart du plus petit d'entre eux
+            base = None
+            for previous, rows in self._refinements.items():
+                if previous in term and (base is None or len(rows) < len(base)):
+                    base = rows
+
+        # Un résultat précédent encore très large ne vaut pas mieux que l'index
+        if base is not None and len(base) <= self.n_rows // 4:
+            result = self._refine(base, term)
+        else:
+            result = self._full_search(term)
+
+        with self._lock:
+            self._refinements[term] = result
+            self._refinements.move_to_end(term)
+            while len(self._refinements) > self.max_refinements:
+                self._refinements.popitem(last=False)
+        return result
+
+    def _full_search(self, term):
+        """
+        Recherche sur tout l'index via les trigrammes
+        """
+        candidates = self._candidate_values(term)
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Vérification exacte de la sous-chaîne sur les seules valeurs candidates
+        candidate_text = self._vocabulary.iloc[candidates]
+        matched = candidates[candidate_text.str.contains(term, regex=False).to_numpy(dtype=bool)]
+        return self._rows_for_values(matched)
+
+    def _refine(self, rows, term):
+        """
+        Filtre un résultat précédent ; le coût dépend du nombre de lignes candidates
+        """
+        if len(rows) == 0:
+            return rows
+
+        mask = np.zeros(len(rows), dtype=bool)
+        for codes, _, _, offset in self._columns:
+            row_codes = codes[rows]
+            local = np.unique(row_codes[row_codes >= 0])
+            if len(local) == 0:
+                continue
+            text = self._vocabulary.iloc[offset + local]
+            matched = local[text.str.contains(term, regex=False).to_numpy(dtype=bool)]
+            if len(matched):
+                mask |= np.isin(row_codes, matched)
+        return rows[mask]
+
+    def _build_trigrams(self):
+        """
+        Construit l'index trigramme -> valeurs de manière vectorisée
+        """
+        if len(self._vocabulary) == 0:
+            self._trigrams = np.empty(0, dtype=np.uint64)
+            self._trigram_starts = np.zeros(1, dtype=np.int64)
+            self._postings = np.empty(0, dtype=np.int64)
+            return
+
+        # Toutes les valeurs bout à bout, séparées par \x00, en points de code
+        joined = '\x00'.join(self._vocabulary.tolist()) + '\x00'
+        codepoints = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        separators = codepoints == 0
+        value_ids = np.cumsum(separators) - separators
+
+        # Un trigramme ne doit pas chevaucher deux valeurs
+        valid = ~(separators[:-2] | separators[1:-1] | separators[2:])
+        trigrams = (codepoints[:-2] << np.uint64(42)) | (codepoints[1:-1] << np.uint64(21)) | codepoints[2:]
+        trigrams = trigrams[valid]
+        value_ids = value_ids[:-2][valid]
+
+        # Tri par (trigramme, valeur) puis suppression des doublons
+        order = np.lexsort((value_ids, trigrams))
+        trigrams = trigrams[order]
+        value_ids = value_ids[order]
+        keep = np.ones(len(trigrams), dtype=bool)
+        keep[1:] = (trigrams[1:] != trigrams[:-1]) | (value_ids[1:] != value_ids[:-1])
+        trigrams = trigrams[keep]
+
+        self._trigrams, starts = np.unique(trigrams, return_index=True)
+        self._trigram_starts = np.append(starts, len(trigrams))
+        self._postings = value_ids[keep]
+
+    def _candidate_values(self, term):
+        """
+        Valeurs pouvant contenir `term` : intersection des listes de ses trigrammes
+        """
+        if len(term) < 3:
+            return np.arange(len(self._vocabulary))
+
+        codepoints = np.frombuffer(term.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        term_trigrams = np.unique(
+            (codepoints[:-2] << np.uint64(42)) | (codepoints[1:-1] << np.uint64(21)) | codepoints[2:]
+        )
+        positions = np.searchsorted(self._trigrams, term_trigrams)
+        found = positions < len(self._trigrams)
+        found[found] = self._trigrams[positions[found]] == term_trigrams[found]
+        if not found.all():
+            # Un trigramme absent de l'index : aucune valeur ne peut correspondre
+            return np.empty(0, dtype=np.int64)
+
+        postings = [
+            self._postings[self._trigram_starts[p]:self._trigram_starts[p + 1]]
+            for p in positions
+        ]
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    def _rows_for_values(self, values):
+        """
+        Convertit des identifiants de valeurs en positions de lignes
+        """
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        pieces = []
+        columns = self._value_column[values]
+        for i in np.unique(columns):
+            codes, rows, starts, _ = self._columns[i]
+            local = self._value_local[values[columns == i]]
+            counts = starts[local + 1] - starts[local]
+            if counts.sum() > len(codes) // 4:
+                # Valeurs très fréquentes : un masque est moins coûteux
+                pieces.append(np.flatnonzero(np.isin(codes, local)))
+            else:
+                pieces.extend(rows[starts[k]:starts[k + 1]] for k in local)
+
+        return np.unique(np.concatenate(pieces))
@@ -0,0 +1,187 @@
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import is_numeric, optimize_dtypes
+from .fingerprint import data_version
+from .profiling import column_profile
+
+# Nom de la table interrogée
+TABLE_NAME = 'donnees'
+
+# Opérations autorisées : lecture seule (SELECT, WITH, fonctions)
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, 'SQLITE_RECURSIVE', 33)
+}
+
+# Commentaires SQL éventuels, puis SELECT ou WITH
+_SELECT = re.compile(r'^\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*(?:select|with)\b', re.IGNORECASE | re.DOTALL)
+
+
+def is_select(query):
+    """
+    Vrai si la requête ressemble à une requête SQL de lecture (SELECT ou WITH)
+
+    Simple filtre pour un message d'erreur clair : c'est l'autorisateur de
+    SQLEngine qui garantit la lecture seule.
+    """
+    return bool(_SELECT.match(query))
+
+
+class SQLEngine:
+    """
+    Base SQLite en mémoire contenant un DataFrame, pour les requêtes que les
+    mots-clés ne savent pas exprimer (agrégations, filtres, sous-requêtes).
+
+    Les données sont chargées une fois dans la table `donnees` ; les colonnes
+    textuelles peu variées sont indexées pour accélérer WHERE et GROUP BY.
+    La connexion est ensuite en lecture seule : toute instruction autre
+    qu'une lecture est refusée par SQLite.
+    """
+
+    # Nombre maximal de lignes renvoyées par une requête
+    MAX_RESULT_ROWS = 100_000
+    # Colonnes indexées : textuelles, au plus ce nombre de valeurs distinctes
+    INDEX_MAX_DISTINCT = 10_000
+    MAX_INDEXES = 8
+    # Fréquence (en instructions SQLite) des vérifications d'annulation
+    PROGRESS_INTERVAL = 10_000
+
+    def __init__(self, df, table=TABLE_NAME, index_columns=None):
+        self.table = table
+        self.columns = [str(col) for col in df.columns]
+        self._lock = threading.Lock()
+        self._should_stop = None
+        self._connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self._load(df)
+        if index_columns is None:
+            index_columns = self._default_index_columns(df)
+        for i, col in enumerate(index_columns):
+            self._connection.execute(
+                f'CREATE INDEX "idx_{i}" ON {_quote(self.table)} ({_quote(str(col))})'
+            )
+        self._connection.execute('ANALYZE')
+        self._connection.set_authorizer(self._authorize)
+        self._connection.set_progress_handler(self._progress, self.PROGRESS_INTERVAL)
+
+    def query(self, sql, should_stop=None, max_rows=None):
+        """
+        Exécute une requête de lecture ; renvoie (DataFrame, tronqué).
+
+        `should_stop()` est appelé régulièrement pendant l'exécution : s'il
+        renvoie vrai, la requête est interrompue (sqlite3.OperationalError).
+        """
+        max_rows = self.MAX_RESULT_ROWS if max_rows is None else max_rows
+        with self._lock:
+            self._should_stop = should_stop
+            try:
+                cursor = self._connection.execute(sql)
+                if cursor.description is None:
+                    return pd.DataFrame(), False
+                names = [description[0] for description in cursor.description]
+                rows = cursor.fetchmany(max_rows + 1)
+            finally:
+                self._should_stop = None
+        truncated = len(rows) > max_rows
+        result = pd.DataFrame.from_records(rows[:max_rows], columns=names)
+        # Dates (stockées en texte) et nombres retrouvent leur type
+        result, _ = optimize_dtypes(result)
+        return result, truncated
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, df):
+        definitions = ', '.join(
+            f'{_quote(name)} {_sql_type(df.iloc[:, i])}' for i, name in enumerate(self.columns)
+        )
+        self._connection.execute(f'CREATE TABLE {_quote(self.table)} ({definitions})')
+        placeholders = ', '.join('?' * len(self.columns))
+        values = [_sql_values(df.iloc[:, i]) for i in range(df.shape[1])]
+        with self._connection:
+            self._connection.executemany(
+                f'INSERT INTO {_quote(self.table)} VALUES ({placeholders})',
+                zip(*values)
+            )
+
+    def _default_index_columns(self, df):
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            if is_numeric(series) or pd.api.types.is_datetime64_any_dtype(series):
+                continue
+            if column_profile(df, col).distinct_count <= self.INDEX_MAX_DISTINCT:
+                columns.append(self.columns[i])
+            if len(columns) == self.MAX_INDEXES:
+                break
+        return columns
+
+    def _authorize(self, action, arg1, arg2, database, trigger):
+        return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+    def _progress(self):
+        # Une valeur non nulle interrompt la requête en cours
+        return 1 if self._should_stop is not None and self._should_stop() else 0
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(series):
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return 'INTEGER'
+    if is_numeric(series):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _sql_values(series):
+    """
+    Valeurs d'une colonne converties en types Python acceptés par SQLite (NULL pour les manquants)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Format ISO : compris par les fonctions de date de SQLite
+        values = series.dt.strftime('%Y-%m-%d %H:%M:%S').astype(object)
+    elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        values = series.astype(object)
+    elif is_numeric(series):
+        values = series.astype(np.float64).astype(object)
+    else:
+        values = series.astype(object)
+        # Textes et autres objets (dates Excel isolées, nombres mêlés au texte)
+        values = values.map(lambda value: value if isinstance(value, (str, int, float)) else str(value))
+    return values.where(series.notna(), None).tolist()
+
+
+# Bases déjà chargées : version des données -> SQLEngine
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+_ENGINE_CACHE_SIZE = 2
+
+
+def sql_engine(df):
+    """
+    Base SQL des données, chargée une seule fois par version des données
+    """
+    key = data_version(df)
+    with _engines_lock:
+        if key in _engines:
+            _engines.move_to_end(key)
+            return _engines[key]
+
+    engine = SQLEngine(df)
+
+    with _engines_lock:
+        _engines[key] = engine
+        while len(_engines) > _ENGINE_CACHE_SIZE:
+            _engines.popitem(last=False)[1].close()
+    return engine
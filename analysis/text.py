@@ -0,0 +1,43 @@
+import re
+import unicodedata
+
+_COMBINING_MARKS = re.compile(r'[\u0300-\u036f]')
+
+# Mots vides du français (liste de NLTK), embarqués pour ne rien télécharger au lancement
+FRENCH_STOP_WORDS = frozenset("""
+au aux avec ce ces dans de des du elle en et eux il ils je la le les leur lui
+ma mais me même mes moi mon ne nos notre nous on ou par pas pour qu que qui
+sa se ses son sur ta te tes toi ton tu un une vos votre vous c d j l à m n s
+t y été étée étées étés étant étante étants étantes suis es est sommes êtes
+sont serai seras sera serons serez seront serais serait serions seriez
+seraient étais était étions étiez étaient fus fut fûmes fûtes furent sois
+soit soyons soyez soient fusse fusses fût fussions fussiez fussent ayant
+ayante ayantes ayants eu eue eues eus ai as avons avez ont aurai auras aura
+aurons aurez auront aurais aurait aurions auriez auraient avais avait avions
+aviez avaient eut eûmes eûtes eurent aie aies ait ayons ayez aient eusse
+eusses eût eussions eussiez eussent
+""".split())
+
+
+def fold_text(text):
+    """
+    Met un texte en minuscules et supprime ses accents ("Évolution" -> "evolution")
+    """
+    text = unicodedata.normalize('NFKD', str(text))
+    return _COMBINING_MARKS.sub('', text).lower()
+
+
+def fold_series(series):
+    """
+    Version vectorisée de fold_text pour une Series de valeurs quelconques
+    """
+    text = series.astype(str).str.normalize('NFKD')
+    return text.str.replace(_COMBINING_MARKS.pattern, '', regex=True).str.lower()
+
+
+def slugify(text, max_length=60):
+    """
+    Nom de fichier lisible tiré d'un texte ("Répartition de ville" -> "repartition_de_ville")
+    """
+    slug = re.sub(r'[^a-z0-9]+', '_', fold_text(text)).strip('_')
+    return slug[:max_length] or 'graphique'
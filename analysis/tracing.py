@@ -0,0 +1,266 @@
+"""
+Mesure des étapes du traitement : durée, temps CPU et pic de mémoire.
+
+    with tracing.span('analyze', query=query):
+        with tracing.span('preprocess'):
+            ...
+
+Désactivé par défaut : span() renvoie alors un objet partagé qui ne fait
+rien, et le coût d'une étape mesurée se limite à un test. Une fois activé
+(enable()), chaque étape racine terminée est conservée dans un historique
+court, transmise aux abonnés (add_listener) et, si un fichier est indiqué,
+écrite sur une ligne JSON.
+
+Le pic de mémoire vient de tracemalloc, qui ralentit les allocations :
+il n'est suivi que si enable(memory=True). tracemalloc étant global au
+processus, le pic d'une étape inclut ce qu'allouent les autres threads
+pendant qu'elle s'exécute.
+"""
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+from .dtypes import format_bytes
+
+_enabled = False
+_memory = False
+_started_tracemalloc = False
+_sink = None
+_sink_lock = threading.Lock()
+_listeners = []
+_recent = deque(maxlen=50)
+_local = threading.local()
+
+
+class Span:
+    """
+    Étape mesurée ; ses sous-étapes sont dans `children`.
+
+    `wall` et `cpu` sont en secondes (le temps CPU est celui du thread qui
+    exécute l'étape), `memory` est le pic de mémoire allouée pendant l'étape
+    en octets (None si la mémoire n'est pas suivie).
+    """
+
+    __slots__ = (
+        'name', 'attributes', 'children', 'thread', 'start', 'wall', 'cpu', 'memory',
+        '_parent', '_wall_start', '_cpu_start', '_memory_start', '_memory_peak'
+    )
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.children = []
+        self.thread = None
+        self.start = None
+        self.wall = None
+        self.cpu = None
+        self.memory = None
+        self._parent = None
+
+    def set(self, **attributes):
+        """
+        Ajoute des informations à l'étape (nombre de lignes, colonne, ...)
+        """
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        stack = _stack()
+        self._parent = stack[-1] if stack else None
+        stack.append(self)
+        self.thread = threading.current_thread().name
+        if _memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Le pic est remis à zéro pour cette étape : celui atteint jusqu'ici revient au parent
+            _raise_peak(self._parent, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = self._memory_peak = current
+        else:
+            self._memory_start = None
+        self.start = time.time()
+        self._cpu_start = time.thread_time()
+        self._wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._wall_start
+        self.cpu = time.thread_time() - self._cpu_start
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            _raise_peak(self, peak)
+            self.memory = self._memory_peak - self._memory_start
+            _raise_peak(self._parent, self._memory_peak)
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if self._parent is not None:
+            self._parent.children.append(self)
+        else:
+            _finish(self)
+        return False
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'start': self.start,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'memory': self.memory,
+            'thread': self.thread,
+            'attributes': {key: _jsonable(value) for key, value in self.attributes.items()},
+            'children': [child.to_dict() for child in self.children]
+        }
+
+
+class _NullSpan:
+    """
+    Étape non mesurée (mesures désactivées)
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **attributes):
+    """
+    Contexte mesurant une étape ; imbriqué dans l'étape en cours du même thread
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, attributes)
+
+
+def bind(func):
+    """
+    Rattache les étapes mesurées par `func` à l'étape en cours, même si
+    `func` est exécutée dans un autre thread (pool de threads)
+    """
+    if not _enabled:
+        return func
+    stack = _stack()
+    if not stack:
+        return func
+    parent = stack[-1]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, 'stack', None)
+        _local.stack = [parent]
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.stack = previous
+    return wrapper
+
+
+def enable(sink=None, memory=True):
+    """
+    Active les mesures ; `sink` est un fichier où ajouter une ligne JSON par étape racine
+    """
+    global _enabled, _memory, _sink, _started_tracemalloc
+    _sink = sink
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _enabled = True
+
+
+def disable():
+    global _enabled, _memory, _started_tracemalloc
+    _enabled = False
+    _memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def sink():
+    """
+    Fichier où les étapes sont écrites, ou None
+    """
+    return _sink
+
+
+def add_listener(callback):
+    """
+    `callback(span)` est appelé (dans le thread de l'étape) à chaque étape racine terminée
+    """
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def recent():
+    """
+    Dernières étapes racines terminées, de la plus ancienne à la plus récente
+    """
+    return list(_recent)
+
+
+def format_span(span, indent=0):
+    """
+    Détail d'une étape et de ses sous-étapes, une ligne par étape
+    """
+    line = f"{'  ' * indent}{span.name:<{32 - 2 * indent}} {span.wall * 1000:9.1f} ms   CPU {span.cpu * 1000:9.1f} ms"
+    if span.memory is not None:
+        line += f"   pic {format_bytes(span.memory)}"
+    details = ', '.join(f"{key}={value}" for key, value in span.attributes.items())
+    if details:
+        line += f"   ({details})"
+    lines = [line]
+    for child in span.children:
+        lines.extend(format_span(child, indent + 1))
+    return lines
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _raise_peak(span, peak):
+    if span is not None and span._memory_start is not None:
+        span._memory_peak = max(span._memory_peak, peak)
+
+
+def _finish(span):
+    _recent.append(span)
+    if _sink is not None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with _sink_lock:
+            with open(_sink, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+    for callback in list(_listeners):
+        callback(span)
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
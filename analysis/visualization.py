@@ -1,17 +1,128 @@
 import matplotlib.pyplot as plt
-import seaborn as sns
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import customtkinter as ctk
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
 import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
+from .dtypes import is_numeric
+from .profiling import ColumnProfile, column_profile
+from .correlation import cluster_order, correlation_matrix
+from .crosstab import crosstab
+from .decimation import lttb, minmax_decimate
+from . import tracing
+
+class _PooledCanvas:
+    """
+    Figure et canevas conservés dans un frame et réutilisés d'un graphique à l'autre.
+
+    Les artistes déclarés « animés » (barres, courbes) sont dessinés par-dessus
+    un fond mémorisé : une mise à jour de leurs données ne redessine qu'eux
+    (blitting) au lieu de toute la figure.
+
+    Sans frame (rendu hors écran), la figure est rendue par le backend Agg.
+    """
+
+    def __init__(self, frame, figsize, dpi):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        if frame is None:
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        else:
+            # Import différé : le rendu hors écran ne doit pas dépendre de Tk
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
+            self.widget = self.canvas.get_tk_widget()
+            self.widget.pack(fill='both', expand=True)
+        # Description du graphique affiché, utilisée pour les mises à jour en place
+        self.state = None
+        self._animated = []
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def is_alive(self):
+        if self.widget is None:
+            return True
+        try:
+            return bool(self.widget.winfo_exists())
+        except Exception:
+            return False
+
+    def reset(self, figsize, facecolor):
+        """
+        Vide la figure pour un nouveau graphique
+        """
+        self.figure.clear()
+        self.figure.set_size_inches(figsize, forward=False)
+        self.figure.patch.set_facecolor(facecolor)
+        self.state = None
+        self._animated = []
+        self._background = None
+        return self.figure
+
+    def draw(self, animated=()):
+        """
+        Rendu complet ; le fond sans les artistes animés est mémorisé au passage
+        """
+        # Hors écran, pas de blitting : un artiste animé serait absent de l'image enregistrée
+        self._animated = list(animated) if self.widget is not None else []
+        for artist in self._animated:
+            artist.set_animated(True)
+        self.canvas.draw()
+
+    def blit(self):
+        """
+        Redessine uniquement les artistes animés sur le fond mémorisé
+        """
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, event):
+        # Appelé après chaque rendu complet (y compris lors d'un redimensionnement)
+        if not self._animated:
+            self._background = None
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            artist.axes.draw_artist(artist)
+
 
 class Visualizer:
-    def __init__(self):
+    # Au-delà de ce nombre de points, le nuage est remplacé par une carte de densité
+    SCATTER_DENSITY_THRESHOLD = 20_000
+    # Réduction des courbes : 'minmax' (min et max par pixel) ou 'lttb'
+    LINE_DECIMATION = 'minmax'
+    # Au-delà de ce nombre de colonnes, la matrice de corrélation est une image
+    # sans annotations, ses colonnes réordonnées pour regrouper les corrélées
+    HEATMAP_ANNOTATION_MAX = 20
+    # Au-delà, les noms des colonnes ne sont plus affichés sur les axes
+    HEATMAP_LABELS_MAX = 60
+    # Graphique de comparaison : groupes (première colonne) et barres par groupe
+    # (seconde colonne) affichés, les autres catégories étant regroupées
+    COMPARISON_TOP_GROUPS = 10
+    COMPARISON_TOP_BARS = 8
+    # Résultat de requête SQL : au-delà de ce nombre de lignes, courbe plutôt que barres
+    RESULT_BAR_MAX = 30
+    
+    # Formats d'image pour lesquels un graphique mis en cache (bitmap) peut être réutilisé
+    BITMAP_FORMATS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.webp')
+    
+    def __init__(self, result_cache=None):
         # Configuration du style des graphiques
         plt.style.use('dark_background')  # Utilisation d'un style standard de matplotlib
         self._setup_custom_colors()
+        # Canevas réutilisés, un par frame d'affichage
+        self._canvases = {}
+        # Images des graphiques déjà rendus (ResultCache), par analyse et taille d'affichage
+        self.result_cache = result_cache
+        # seaborn, importé au premier graphique (voir _seaborn)
+        self._sns = None
         
     def _setup_custom_colors(self):
         """Configure les couleurs personnalisées pour les graphiques"""
@@ -25,41 +136,115 @@ class Visualizer:
             ['#2ecc71', '#3498db', '#9b59b6', '#e74c3c']
         )
         
-        # Configuration des styles Seaborn
-        sns.set_palette(self.colors)
-        sns.set_style("darkgrid")  # Utilisation d'un style Seaborn standard
+    def _seaborn(self):
+        """
+        Importe seaborn et applique son style au premier graphique plutôt qu'au lancement
+        """
+        if self._sns is None:
+            import seaborn as sns
+            
+            # Configuration des styles Seaborn
+            sns.set_palette(self.colors)
+            sns.set_style("darkgrid")  # Utilisation d'un style Seaborn standard
+            self._sns = sns
+        return self._sns
         
-    def create_visualizations(self, df, analysis_results, frame, chart_type=None):
+    def create_visualizations(self, df, analysis_results, frame, chart_type=None, use_bitmap_cache=True):
         """
         Crée les visualisations appropriées en fonction des résultats d'analyse
+
+        Si un cache de résultats est configuré, l'image d'une analyse déjà
+        rendue à la même taille est réaffichée telle quelle, sans retracer le graphique.
         """
-        # Nettoyage du frame
-        for widget in frame.winfo_children():
-            widget.destroy()
-            
         data = analysis_results['data']
         columns = analysis_results['columns']
         intent = analysis_results['intent']
+        bitmap_key = self._bitmap_key(analysis_results, frame, chart_type) if use_bitmap_cache else None
+        
+        with tracing.span('render', chart=chart_type or intent['type'], rows=len(data)) as span:
+            if bitmap_key is not None:
+                bitmap = self.result_cache.get(bitmap_key)
+                if bitmap is not None:
+                    span.set(cached=True)
+                    self._clear_frame(frame)
+                    self._show_bitmap(frame, bitmap)
+                    return
+            
+            # Le style seaborn doit être en place avant de créer la figure
+            with tracing.span('load_seaborn'):
+                self._seaborn()
+            
+            # Nettoyage du frame, en conservant le canevas réutilisable
+            self._clear_frame(frame)
+            
+            # Création des graphiques en fonction du type demandé
+            with tracing.span('plot'):
+                if chart_type == 'pie':
+                    self._create_pie_chart(data, columns, frame)
+                elif chart_type == 'bar':
+                    self._create_bar_chart(data, columns, frame)
+                elif chart_type == 'line':
+                    self._create_line_chart(data, columns, frame)
+                elif chart_type == 'scatter':
+                    self._create_scatter_plot(data, columns, frame)
+                elif chart_type == 'box':
+                    self._create_box_plot(data, columns, frame)
+                elif chart_type == 'correlation':
+                    self._create_correlation_matrix(data, columns, frame)
+                elif chart_type == 'result':
+                    self._create_result_chart(data, columns, frame)
+                elif intent['type'] == 'comparison':
+                    self._create_comparison_visualizations(data, columns, frame)
+                elif intent['type'] == 'distribution':
+                    self._create_distribution_visualizations(data, columns, frame)
+                else:
+                    self._create_basic_visualizations(data, columns, frame)
+            
+            if bitmap_key is not None:
+                self._store_bitmap(frame, bitmap_key)
+            
+    def _clear_frame(self, frame):
+        """
+        Détruit le contenu du frame, sauf le canevas réutilisable
+        """
+        pooled = self._pooled_canvas(frame)
+        if frame is not None:
+            for widget in frame.winfo_children():
+                if pooled is None or widget is not pooled.widget:
+                    widget.destroy()
+            
+    def _bitmap_key(self, analysis_results, frame, chart_type):
+        """
+        Clé de l'image d'une analyse mise en cache, ou None si elle ne peut pas l'être
+        """
+        if self.result_cache is None or 'cache_key' not in analysis_results:
+            return None
+        # L'image dépend de la taille d'affichage ; hors écran, la figure a une taille fixe
+        size = None if frame is None else (frame.winfo_width(), frame.winfo_height())
+        return self.result_cache.derived_key(analysis_results['cache_key'], 'bitmap', chart_type, size)
+        
+    def _store_bitmap(self, frame, key):
+        pooled = self._pooled_canvas(frame)
+        if pooled is None or not pooled.figure.axes:
+            return
+        pixels = np.asarray(pooled.canvas.buffer_rgba()).copy()
+        self.result_cache.put(key, {'pixels': pixels, 'facecolor': pooled.figure.get_facecolor()})
         
-        # Création des graphiques en fonction du type demandé
-        if chart_type == 'pie':
-            self._create_pie_chart(data, columns, frame)
-        elif chart_type == 'bar':
-            self._create_bar_chart(data, columns, frame)
-        elif chart_type == 'line':
-            self._create_line_chart(data, columns, frame)
-        elif chart_type == 'scatter':
-            self._create_scatter_plot(data, columns, frame)
-        elif chart_type == 'box':
-            self._create_box_plot(data, columns, frame)
-        elif chart_type == 'correlation':
-            self._create_correlation_matrix(data, columns, frame)
-        elif intent['type'] == 'comparison':
-            self._create_comparison_visualizations(data, columns, frame)
-        elif intent['type'] == 'distribution':
-            self._create_distribution_visualizations(data, columns, frame)
-        else:
-            self._create_basic_visualizations(data, columns, frame)
+    def _show_bitmap(self, frame, bitmap):
+        """
+        Affiche une image de graphique mise en cache, à sa taille en pixels
+        """
+        height, width = bitmap['pixels'].shape[:2]
+        pooled = self._pooled_canvas(frame)
+        dpi = pooled.figure.dpi if pooled is not None else 100
+        fig = self._new_figure(
+            frame,
+            figsize=(width / dpi, height / dpi),
+            dpi=dpi,
+            facecolor=bitmap['facecolor']
+        )
+        fig.figimage(bitmap['pixels'], origin='upper', resize=False)
+        self._draw(frame, tight_layout=False)
             
     def _create_basic_visualizations(self, df, columns, frame):
         """
@@ -69,45 +254,39 @@ class Visualizer:
         n_cols = min(2, len(columns))
         n_rows = (len(columns) + 1) // 2
         
-        fig = Figure(figsize=(12, 4 * n_rows), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(12, 4 * n_rows))
         
         for i, col in enumerate(columns):
             ax = fig.add_subplot(n_rows, n_cols, i + 1)
             ax.set_facecolor('#2b2b2b')
             
-            if df[col].dtype in ['int64', 'float64']:
+            if is_numeric(df[col]):
                 # Graphique pour les données numériques
-                sns.histplot(data=df, x=col, ax=ax, color=self.colors[i % len(self.colors)])
+                self._seaborn().histplot(data=df, x=col, ax=ax, color=self.colors[i % len(self.colors)])
                 ax.set_title(f'Distribution de {col}', color='white')
             else:
                 # Graphique pour les données catégorielles
-                value_counts = df[col].value_counts().head(10)
-                sns.barplot(x=value_counts.index, y=value_counts.values, ax=ax, palette=self.colors)
+                value_counts = column_profile(df, col).top(10)
+                self._seaborn().barplot(x=value_counts.index, y=value_counts.values, ax=ax, palette=self.colors)
                 ax.set_title(f'Top 10 de {col}', color='white')
-                plt.xticks(rotation=45)
+                ax.tick_params(axis='x', rotation=45)
                 
             # Personnalisation des axes
             ax.tick_params(colors='white')
             ax.xaxis.label.set_color('white')
             ax.yaxis.label.set_color('white')
             
-        fig.tight_layout()
-        
         # Intégration dans l'interface
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw(frame)
         
     def _create_pie_chart(self, df, columns, frame):
         """
         Crée un diagramme circulaire (camembert)
         """
         col = columns[0]
-        value_counts = df[col].value_counts().head(10)
+        value_counts = column_profile(df, col).top(10)
         
-        fig = Figure(figsize=(8, 8), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(8, 8))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
@@ -126,50 +305,70 @@ class Visualizer:
         
         ax.set_title(f"Répartition de {col}", color='white')
         
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw(frame, tight_layout=False)
         
     def _create_bar_chart(self, df, columns, frame):
         """
         Crée un diagramme en barres
         """
         col = columns[0]
-        value_counts = df[col].value_counts().head(10)
+        value_counts = column_profile(df, col).top(10)
+        
+        # Même colonne et mêmes catégories : seules les hauteurs changent
+        state = self._reusable_state(frame, 'bar', col)
+        if state is not None and state['labels'] == value_counts.index.tolist():
+            ax = state['ax']
+            for bar, height in zip(ax.patches, value_counts.values):
+                bar.set_height(height)
+            self._refresh_in_place(frame, ax, value_counts.max() > ax.get_ylim()[1])
+            return
         
-        fig = Figure(figsize=(10, 6), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(10, 6))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
         # Création du graphique
-        sns.barplot(x=value_counts.index, y=value_counts.values, ax=ax, palette=self.colors)
+        self._seaborn().barplot(x=value_counts.index, y=value_counts.values, ax=ax, palette=self.colors)
         
         # Personnalisation
         ax.set_title(f'Top 10 de {col}', color='white')
         ax.tick_params(colors='white')
         ax.xaxis.label.set_color('white')
         ax.yaxis.label.set_color('white')
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', rotation=45)
         
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw(
+            frame,
+            animated=ax.patches,
+            state={'kind': 'bar', 'key': col, 'ax': ax, 'labels': value_counts.index.tolist()}
+        )
         
     def _create_line_chart(self, df, columns, frame):
         """
         Crée un graphique en ligne
         """
-        fig = Figure(figsize=(10, 6), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        numeric_columns = [col for col in columns if is_numeric(df[col])]
+        
+        # Mêmes colonnes : les courbes existantes reçoivent les nouvelles données
+        state = self._reusable_state(frame, 'line', tuple(numeric_columns))
+        if state is not None:
+            ax = state['ax']
+            x_limits, y_limits = ax.get_xlim(), ax.get_ylim()
+            limits_changed = False
+            for line, (x, y) in zip(state['lines'], self._decimated_lines(df, numeric_columns, frame)):
+                line.set_data(x, y)
+                limits_changed |= not self._within(x, x_limits) or not self._within(y, y_limits)
+            self._refresh_in_place(frame, ax, limits_changed)
+            return
+        
+        fig = self._new_figure(frame, figsize=(10, 6))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
-        for i, col in enumerate(columns):
-            if df[col].dtype in ['int64', 'float64']:
-                df[col].plot(ax=ax, label=col, color=self.colors[i % len(self.colors)])
+        lines = []
+        for i, (col, (x, y)) in enumerate(zip(numeric_columns, self._decimated_lines(df, numeric_columns, frame, fig))):
+            line, = ax.plot(x, y, label=col, color=self.colors[i % len(self.colors)])
+            lines.append(line)
                 
         # Personnalisation
         ax.set_title('Évolution des valeurs', color='white')
@@ -178,11 +377,41 @@ class Visualizer:
         ax.yaxis.label.set_color('white')
         ax.legend(facecolor='#2b2b2b', edgecolor='none', labelcolor='white')
         
-        fig.tight_layout()
+        self._draw(
+            frame,
+            animated=lines,
+            state={'kind': 'line', 'key': tuple(numeric_columns), 'ax': ax, 'lines': lines}
+        )
         
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def _decimated_lines(self, df, columns, frame, fig=None):
+        """
+        Points (x, y) à tracer pour chaque colonne : leur nombre dépend de la
+        largeur du canevas, pas du nombre de lignes
+        """
+        if fig is None:
+            fig = self._canvases[frame].figure
+        width = self._pixel_width(fig, frame)
+        x = self._line_x(df)
+        for col in columns:
+            y = df[col].to_numpy(dtype=np.float64)
+            if self.LINE_DECIMATION == 'lttb':
+                keep = lttb(np.arange(len(y)), y, 2 * width)
+            else:
+                keep = minmax_decimate(y, width)
+            yield x[keep], y[keep]
+            
+    def _within(self, values, limits):
+        """
+        Indique si des valeurs tiennent dans les limites actuelles d'un axe
+        """
+        values = np.asarray(values)
+        if values.size == 0:
+            return True
+        try:
+            return bool(limits[0] <= np.nanmin(values) and np.nanmax(values) <= limits[1])
+        except TypeError:
+            # Dates : pas de comparaison directe avec les limites, on redessine
+            return False
         
     def _create_scatter_plot(self, df, columns, frame):
         """
@@ -191,19 +420,37 @@ class Visualizer:
         if len(columns) < 2:
             return
             
-        fig = Figure(figsize=(10, 6), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(10, 6))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
         # Création du graphique
-        sns.scatterplot(
-            data=df,
-            x=columns[0],
-            y=columns[1],
-            ax=ax,
-            color=self.colors[0]
-        )
+        x_numeric = is_numeric(df[columns[0]])
+        y_numeric = is_numeric(df[columns[1]])
+        if len(df) > self.SCATTER_DENSITY_THRESHOLD and x_numeric and y_numeric:
+            # Trop de points : densité par cellules dimensionnée sur la largeur du canevas
+            gridsize = max(10, self._pixel_width(fig, frame) // 12)
+            ax.hexbin(
+                df[columns[0]].to_numpy(dtype=np.float64),
+                df[columns[1]].to_numpy(dtype=np.float64),
+                gridsize=gridsize,
+                cmap=self.cmap,
+                mincnt=1
+            )
+            ax.set_xlabel(columns[0])
+            ax.set_ylabel(columns[1])
+        else:
+            data = df
+            if len(df) > self.SCATTER_DENSITY_THRESHOLD:
+                # Axe catégoriel : échantillon reproductible
+                data = df.sample(self.SCATTER_DENSITY_THRESHOLD, random_state=0)
+            self._seaborn().scatterplot(
+                data=data,
+                x=columns[0],
+                y=columns[1],
+                ax=ax,
+                color=self.colors[0]
+            )
         
         # Personnalisation
         ax.set_title(f'Relation entre {columns[0]} et {columns[1]}', color='white')
@@ -211,23 +458,134 @@ class Visualizer:
         ax.xaxis.label.set_color('white')
         ax.yaxis.label.set_color('white')
         
-        fig.tight_layout()
+        self._draw(frame)
         
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def render_to_file(self, df, analysis_results, path, chart_type=None, **savefig_kwargs):
+        """
+        Rendu hors écran (sans Tk) d'une analyse dans un fichier image (PNG, SVG, ...)
+        """
+        # Figure vidée au préalable pour ne jamais réenregistrer le graphique précédent
+        self._new_figure(None, figsize=(10, 6))
+        # Une image mise en cache ne convient qu'aux formats bitmap, à la résolution de rendu
+        use_bitmap_cache = (
+            str(path).lower().endswith(self.BITMAP_FORMATS)
+            and 'dpi' not in savefig_kwargs
+        )
+        self.create_visualizations(
+            df,
+            analysis_results,
+            None,
+            chart_type=chart_type,
+            use_bitmap_cache=use_bitmap_cache
+        )
+        figure = self._canvases[None].figure
+        if not figure.axes and not figure.images:
+            raise ValueError("Aucun graphique produit pour cette analyse")
+        self.save_figure(path, **savefig_kwargs)
+        
+    def save_figure(self, path, frame=None, **savefig_kwargs):
+        """
+        Enregistre le dernier graphique rendu dans un frame (par défaut, le rendu hors écran)
+        """
+        pooled = self._pooled_canvas(frame)
+        if pooled is None:
+            raise ValueError("Aucun graphique à enregistrer")
+        savefig_kwargs.setdefault('facecolor', pooled.figure.get_facecolor())
+        pooled.figure.savefig(path, **savefig_kwargs)
+        
+    def _pooled_canvas(self, frame):
+        """
+        Canevas réutilisable du frame, s'il existe encore
+        """
+        pooled = self._canvases.get(frame)
+        if pooled is not None and not pooled.is_alive():
+            del self._canvases[frame]
+            pooled = None
+        return pooled
+        
+    def _new_figure(self, frame, figsize, dpi=100, facecolor='#2b2b2b'):
+        """
+        Renvoie la figure du frame, vidée, plutôt que d'en créer une nouvelle à chaque graphique
+        """
+        if facecolor is None:
+            facecolor = plt.rcParams['figure.facecolor']
+        pooled = self._pooled_canvas(frame)
+        if pooled is None:
+            pooled = _PooledCanvas(frame, figsize, dpi)
+            self._canvases[frame] = pooled
+        return pooled.reset(figsize, facecolor)
+        
+    def _draw(self, frame, tight_layout=True, animated=(), state=None):
+        """
+        Affiche la figure du frame ; `state` décrit le graphique pour de futures mises à jour en place
+        """
+        pooled = self._canvases[frame]
+        if tight_layout:
+            with tracing.span('tight_layout'):
+                pooled.figure.tight_layout()
+        pooled.state = state
+        with tracing.span('draw'):
+            pooled.draw(animated)
+        
+    def _reusable_state(self, frame, kind, key):
+        """
+        État du graphique affiché s'il est du même type et sur les mêmes colonnes
+        """
+        pooled = self._pooled_canvas(frame)
+        if pooled is None or pooled.state is None:
+            return None
+        if pooled.state['kind'] != kind or pooled.state['key'] != key:
+            return None
+        return pooled.state
+        
+    def _refresh_in_place(self, frame, ax, limits_changed):
+        """
+        Blitting si les axes n'ont pas à changer, sinon rendu complet avec nouvelles limites
+        """
+        pooled = self._canvases[frame]
+        if limits_changed:
+            ax.relim()
+            ax.autoscale_view()
+            pooled.canvas.draw()
+        else:
+            pooled.blit()
+        
+    def _pixel_width(self, fig, frame):
+        """
+        Largeur de rendu en pixels : celle du frame s'il est affiché, sinon celle de la figure
+        """
+        if frame is not None:
+            width = frame.winfo_width()
+            if width > 1:
+                return int(width)
+        return int(fig.get_figwidth() * fig.dpi)
+        
+    def _line_x(self, df):
+        """
+        Abscisses d'une courbe : l'index s'il est numérique ou temporel, sinon la position
+        """
+        if pd.api.types.is_numeric_dtype(df.index) or pd.api.types.is_datetime64_any_dtype(df.index):
+            return df.index.to_numpy()
+        return np.arange(len(df))
         
     def _create_box_plot(self, df, columns, frame):
         """
         Crée un diagramme en boîte
         """
-        fig = Figure(figsize=(10, 6), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(10, 6))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
-        # Création du graphique
-        sns.boxplot(data=df[columns], ax=ax, palette=self.colors)
+        # Création du graphique à partir des quantiles du profil des colonnes
+        # (une boîte par groupe si la requête associe une valeur et un regroupement)
+        stats = self._grouped_box_stats(df, columns)
+        if stats is None:
+            stats = [column_profile(df, col).box_stats() for col in columns]
+            stats = [stat for stat in stats if stat is not None]
+        if stats:
+            boxes = ax.bxp(stats, showfliers=False, patch_artist=True)
+            for i, box in enumerate(boxes['boxes']):
+                box.set_facecolor(self.colors[i % len(self.colors)])
         
         # Personnalisation
         ax.set_title('Distribution des valeurs', color='white')
@@ -235,43 +593,86 @@ class Visualizer:
         ax.xaxis.label.set_color('white')
         ax.yaxis.label.set_color('white')
         
-        fig.tight_layout()
+        self._draw(frame)
         
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def _grouped_box_stats(self, df, columns):
+        """
+        Boîtes d'une colonne numérique pour chacun des groupes les plus
+        fréquents d'une autre colonne (textuelle, ou à peu de valeurs
+        distinctes), ou None si les deux colonnes ne s'y prêtent pas
+        """
+        if len(columns) != 2:
+            return None
+        first, second = (column_profile(df, col) for col in columns)
+        if first.is_numeric != second.is_numeric:
+            value, group = columns if first.is_numeric else columns[::-1]
+        elif first.is_numeric:
+            # Deux colonnes numériques : la moins variée sert de regroupement
+            value, group = columns if first.distinct_count > second.distinct_count else columns[::-1]
+            if column_profile(df, group).distinct_count > self.COMPARISON_TOP_GROUPS:
+                return None
+        else:
+            return None
+
+        stats = []
+        for label in column_profile(df, group).top(self.COMPARISON_TOP_GROUPS).index:
+            values = df.loc[(df[group] == label).to_numpy(), value]
+            stat = ColumnProfile.from_series(values).box_stats(label=str(label))
+            if stat is not None:
+                stats.append(stat)
+        return stats or None
         
     def _create_correlation_matrix(self, df, columns, frame):
         """
         Crée une matrice de corrélation
         """
-        # Calcul de la matrice de corrélation
-        corr_matrix = df[columns].corr()
+        # Calcul de la matrice de corrélation (float32, par blocs, mise en cache)
+        corr_matrix = correlation_matrix(df, columns)
         
-        fig = Figure(figsize=(10, 8), dpi=100)
-        fig.patch.set_facecolor('#2b2b2b')
+        fig = self._new_figure(frame, figsize=(10, 8))
         ax = fig.add_subplot(111)
         ax.set_facecolor('#2b2b2b')
         
-        # Création du graphique
-        sns.heatmap(
-            corr_matrix,
-            annot=True,
-            cmap=self.cmap,
-            ax=ax,
-            fmt='.2f',
-            square=True
-        )
+        if len(columns) <= self.HEATMAP_ANNOTATION_MAX:
+            # Création du graphique
+            self._seaborn().heatmap(
+                corr_matrix,
+                annot=True,
+                cmap=self.cmap,
+                ax=ax,
+                fmt='.2f',
+                square=True
+            )
+        else:
+            # Une image plutôt qu'un rectangle par cellule : le rendu ne dépend
+            # plus du nombre de colonnes
+            order = cluster_order(corr_matrix)
+            corr_matrix = corr_matrix.loc[order, order]
+            image = ax.imshow(
+                corr_matrix.to_numpy(),
+                cmap=self.cmap,
+                vmin=-1,
+                vmax=1,
+                interpolation='nearest',
+                aspect='equal'
+            )
+            ax.grid(False)
+            colorbar = fig.colorbar(image, ax=ax)
+            colorbar.ax.tick_params(colors='white')
+            if len(columns) <= self.HEATMAP_LABELS_MAX:
+                positions = np.arange(len(order))
+                ax.set_xticks(positions, labels=order, rotation=90, fontsize=6)
+                ax.set_yticks(positions, labels=order, fontsize=6)
+            else:
+                ax.set_xticks([])
+                ax.set_yticks([])
+                ax.set_xlabel(f'{len(columns)} colonnes (regroupées par corrélation)', color='white')
         
         # Personnalisation
         ax.set_title('Matrice de corrélation', color='white')
         ax.tick_params(colors='white')
         
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw(frame)
 
     def _create_comparison_visualizations(self, df, columns, frame):
         """
@@ -280,35 +681,82 @@ class Visualizer:
         if len(columns) < 2:
             return
             
-        fig = Figure(figsize=(12, 6))
+        # Effectifs croisés des catégories les plus fréquentes, les autres regroupées
+        df_grouped = crosstab(
+            df[columns[0]],
+            df[columns[1]],
+            top_rows=self.COMPARISON_TOP_GROUPS,
+            top_columns=self.COMPARISON_TOP_BARS
+        )
+        if df_grouped.empty:
+            return
+            
+        fig = self._new_figure(frame, figsize=(12, 6), facecolor=None)
         ax = fig.add_subplot(111)
         
         # Création d'un graphique de comparaison
-        df_grouped = df.groupby(columns[0])[columns[1]].value_counts().unstack()
         df_grouped.plot(kind='bar', ax=ax)
         
         ax.set_title(f'Comparaison entre {columns[0]} et {columns[1]}')
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', rotation=45)
+        
+        self._draw(frame)
+        
+    def _create_result_chart(self, df, columns, frame):
+        """
+        Graphique d'un résultat déjà agrégé (requête SQL) : les valeurs sont
+        tracées telles quelles, sans recompter les lignes
+        """
+        values = [col for col in columns if is_numeric(df[col])][:5]
+        labels = [col for col in columns if col not in values]
+        if not values:
+            # Aucune valeur numérique : fréquence de la première colonne
+            self._create_bar_chart(df, columns, frame)
+            return
+        if not labels:
+            if len(values) >= 2:
+                self._create_scatter_plot(df, values, frame)
+            else:
+                self._create_distribution_visualizations(df, values, frame)
+            return
+            
+        fig = self._new_figure(frame, figsize=(10, 6))
+        ax = fig.add_subplot(111)
+        ax.set_facecolor('#2b2b2b')
         
-        fig.tight_layout()
+        data = df.set_index(labels[0])[values]
+        if len(data) <= self.RESULT_BAR_MAX:
+            data.plot(kind='bar', ax=ax, color=self.colors[:len(values)], legend=len(values) > 1)
+            ax.tick_params(axis='x', rotation=45)
+        else:
+            # Beaucoup de lignes : courbes, réduites à la largeur du canevas
+            if pd.api.types.is_numeric_dtype(data.index) or pd.api.types.is_datetime64_any_dtype(data.index):
+                data = data.sort_index()
+            for i, (col, (x, y)) in enumerate(zip(values, self._decimated_lines(data, values, frame, fig))):
+                ax.plot(x, y, label=col, color=self.colors[i % len(self.colors)])
+            if len(values) > 1:
+                ax.legend(facecolor='#2b2b2b', edgecolor='none', labelcolor='white')
+                
+        # Personnalisation
+        ax.set_title(', '.join(values) + f' par {labels[0]}', color='white')
+        ax.set_xlabel(labels[0])
+        ax.tick_params(colors='white')
+        ax.xaxis.label.set_color('white')
+        ax.yaxis.label.set_color('white')
         
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw(frame)
         
     def _create_distribution_visualizations(self, df, columns, frame):
         """
         Crée des visualisations de distribution
         """
-        fig = Figure(figsize=(12, 6))
+        fig = self._new_figure(frame, figsize=(12, 6), facecolor=None)
         
         for i, col in enumerate(columns):
             ax = fig.add_subplot(1, len(columns), i + 1)
-            sns.boxplot(data=df, y=col, ax=ax)
+            stats = column_profile(df, col).box_stats()
+            if stats is not None:
+                ax.bxp([stats], showfliers=False)
             ax.set_title(f'Distribution de {col}')
             
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True) 
\ No newline at end of file
+        self._draw(frame) 
\ No newline at end of file
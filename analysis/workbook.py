@@ -0,0 +1,123 @@
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+import pandas as pd
+
+from .dtypes import MemoryReport
+from .import_cache import ImportCache
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def list_sheets(file_path):
+    """
+    Noms des feuilles d'un classeur, lus dans ses métadonnées sans parser les cellules
+    """
+    if zipfile.is_zipfile(file_path):
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return _xlsx_sheet_names(archive)
+        except (KeyError, ElementTree.ParseError):
+            # Archive inattendue : on laisse pandas s'en charger
+            pass
+
+    # Ancien format .xls : la liste vient de l'en-tête du fichier
+    with pd.ExcelFile(file_path) as workbook:
+        return list(workbook.sheet_names)
+
+
+def _xlsx_sheet_names(archive):
+    """
+    Feuilles déclarées dans le workbook.xml d'un classeur .xlsx, dans l'ordre des onglets
+    """
+    workbook_path = 'xl/workbook.xml'
+    # Le chemin du workbook est donné par les relations du paquet
+    with archive.open('_rels/.rels') as f:
+        for relation in ElementTree.parse(f).getroot().iter(f'{_REL_NS}Relationship'):
+            if relation.get('Type', '').endswith('/officeDocument'):
+                workbook_path = posixpath.normpath(relation.get('Target').lstrip('/'))
+                break
+
+    with archive.open(workbook_path) as f:
+        root = ElementTree.parse(f).getroot()
+    return [sheet.get('name') for sheet in root.iter(f'{_MAIN_NS}sheet')]
+
+
+class Workbook:
+    """
+    Classeur Excel dont les feuilles sont chargées à la demande.
+
+    La liste des feuilles est lue dans les métadonnées du fichier ; une
+    feuille n'est parsée (ou relue depuis le cache d'import) que lorsqu'elle
+    est demandée. Les feuilles chargées sont conservées dans un LRU borné en
+    mémoire : au-delà de `max_bytes`, les moins récemment utilisées sont
+    libérées (et seront relues depuis le cache disque si besoin).
+
+    Avec optimize=True (par défaut), les feuilles sont converties en types
+    compacts à l'import (voir optimize_dtypes).
+    """
+
+    def __init__(self, file_path, cache=None, max_bytes=512 * 1024 ** 2, optimize=True):
+        self.file_path = file_path
+        self.cache = cache or ImportCache()
+        self.max_bytes = max_bytes
+        self.optimize = optimize
+        self.sheet_names = list_sheets(file_path)
+        self._sheets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def sheet(self, name=None):
+        """
+        Renvoie une feuille (par défaut la première), en la chargeant si nécessaire
+        """
+        if name is None:
+            name = self.sheet_names[0]
+        if name not in self.sheet_names:
+            raise KeyError(f"Feuille introuvable : {name}")
+
+        with self._lock:
+            if name in self._sheets:
+                self._sheets.move_to_end(name)
+                return self._sheets[name][0]
+
+        df = self.cache.read_excel(self.file_path, sheet_name=name, optimize=self.optimize)
+        nbytes = int(df.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._sheets[name] = (df, nbytes)
+            self._sheets.move_to_end(name)
+            self._evict()
+        return df
+
+    def memory_report(self, name):
+        """
+        Bilan mémoire de la conversion en types compacts d'une feuille, ou None
+        """
+        if not self.optimize:
+            return None
+        report = self.cache.memory_report(self.file_path, name)
+        return MemoryReport.from_dict(report) if report else None
+
+    def memory_usage(self):
+        """
+        Mémoire occupée par les feuilles chargées, en octets
+        """
+        with self._lock:
+            return sum(nbytes for _, nbytes in self._sheets.values())
+
+    def clear(self):
+        with self._lock:
+            self._sheets.clear()
+
+    def _evict(self):
+        """
+        Libère les feuilles les moins récemment utilisées (la dernière chargée est conservée)
+        """
+        total = sum(nbytes for _, nbytes in self._sheets.values())
+        while total > self.max_bytes and len(self._sheets) > 1:
+            _, (_, nbytes) = self._sheets.popitem(last=False)
+            total -= nbytes
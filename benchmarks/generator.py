@@ -0,0 +1,130 @@
+"""
+Génération de classeurs synthétiques reproductibles pour les mesures de performance.
+
+    python -m benchmarks.generator sortie.xlsx --rows 100000 --columns 20 --cardinality 50
+
+Une même graine et les mêmes paramètres produisent toujours le même classeur.
+"""
+import argparse
+import string
+
+import numpy as np
+import pandas as pd
+
+# Mots servant à composer les valeurs textuelles (et les noms de colonnes)
+_WORDS = [
+    'paris', 'lyon', 'marseille', 'nantes', 'lille', 'rennes', 'nice', 'bordeaux',
+    'client', 'produit', 'commande', 'service', 'region', 'agence', 'contrat', 'statut'
+]
+
+
+def generate_frame(rows=10000, columns=10, cardinality=50, text_length=12,
+                   numeric_ratio=0.5, missing_ratio=0.01, seed=0):
+    """
+    DataFrame synthétique.
+
+    - `columns` colonnes, dont une proportion `numeric_ratio` de nombres
+      (entiers et flottants en alternance), les autres textuelles
+    - chaque colonne textuelle a `cardinality` valeurs distinctes d'environ
+      `text_length` caractères, avec des variantes de casse et d'accents
+      (comme des saisies manuelles) pour exercer le regroupement
+    - une colonne de dates, et une proportion `missing_ratio` de cellules vides
+    """
+    rng = np.random.default_rng(seed)
+    n_numeric = int(round(columns * numeric_ratio))
+    data = {}
+
+    for i in range(columns - 1):
+        name = f"{_WORDS[i % len(_WORDS)].capitalize()} {i}"
+        if i < n_numeric:
+            if i % 2:
+                data[name] = rng.normal(100, 25, rows).round(2)
+            else:
+                data[name] = rng.integers(0, 1000, rows)
+        else:
+            vocabulary = _text_values(rng, cardinality, text_length)
+            # Répartition de Zipf : quelques valeurs très fréquentes, une longue traîne
+            weights = 1 / np.arange(1, cardinality + 1)
+            data[name] = rng.choice(vocabulary, size=rows, p=weights / weights.sum())
+
+    start = np.datetime64('2020-01-01')
+    data['Date'] = start + rng.integers(0, 5 * 365, rows).astype('timedelta64[D]')
+
+    df = pd.DataFrame(data)
+    if missing_ratio:
+        for col in df.columns[:-1]:
+            missing = rng.random(rows) < missing_ratio
+            if df[col].dtype.kind in 'iu':
+                df[col] = df[col].astype('float64')
+            df.loc[missing, col] = np.nan
+    return df
+
+
+def _text_values(rng, cardinality, text_length):
+    """
+    `cardinality` libellés distincts, certains étant des variantes d'un autre
+    """
+    letters = np.array(list(string.ascii_lowercase))
+    values = []
+    seen = set()
+    while len(values) < cardinality:
+        if values and rng.random() < 0.2:
+            # Variante d'un libellé existant : majuscules ou accent
+            base = values[rng.integers(len(values))]
+            value = base.upper() if rng.random() < 0.5 else base.replace('e', 'é', 1)
+        else:
+            word = _WORDS[rng.integers(len(_WORDS))]
+            suffix = ''.join(rng.choice(letters, max(0, text_length - len(word) - 1)))
+            value = f"{word} {suffix}".strip()
+        if value not in seen:
+            seen.add(value)
+            values.append(value)
+    return np.array(values, dtype=object)
+
+
+def generate_workbook(path, sheets=1, **kwargs):
+    """
+    Écrit un classeur Excel synthétique (une ou plusieurs feuilles) et renvoie son chemin
+    """
+    seed = kwargs.pop('seed', 0)
+    with pd.ExcelWriter(path) as writer:
+        for i in range(sheets):
+            df = generate_frame(seed=seed + i, **kwargs)
+            df.to_excel(writer, sheet_name=f"Feuille {i + 1}", index=False)
+    return path
+
+
+def add_arguments(parser):
+    """
+    Options de génération, partagées avec benchmarks.pipeline
+    """
+    parser.add_argument('--rows', type=int, default=10000, help="Nombre de lignes")
+    parser.add_argument('--columns', type=int, default=10, help="Nombre de colonnes")
+    parser.add_argument('--cardinality', type=int, default=50, help="Valeurs distinctes par colonne textuelle")
+    parser.add_argument('--text-length', type=int, default=12, help="Longueur des valeurs textuelles")
+    parser.add_argument('--numeric-ratio', type=float, default=0.5, help="Proportion de colonnes numériques")
+    parser.add_argument('--seed', type=int, default=0, help="Graine aléatoire")
+
+
+def generator_options(args):
+    return {
+        'rows': args.rows,
+        'columns': args.columns,
+        'cardinality': args.cardinality,
+        'text_length': args.text_length,
+        'numeric_ratio': args.numeric_ratio,
+        'seed': args.seed
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un classeur Excel synthétique")
+    parser.add_argument('path', help="Fichier .xlsx à créer")
+    parser.add_argument('--sheets', type=int, default=1, help="Nombre de feuilles")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    generate_workbook(args.path, sheets=args.sheets, **generator_options(args))
+
+
+if __name__ == '__main__':
+    main()
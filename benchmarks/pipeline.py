@@ -0,0 +1,274 @@
+"""
+Mesure des étapes du traitement sur un classeur synthétique : import,
+recherche, suggestions, analyse et rendu de chaque type de graphique.
+
+    python -m benchmarks.pipeline [--rows 100000] [--columns 20] [--repeat 5] [--json resultats.json]
+    python -m benchmarks.pipeline --baseline reference.json     # mesure puis compare
+    python -m benchmarks.pipeline --compare reference.json resultats.json
+
+Chaque étape est mesurée à froid : à chaque répétition, les données sont
+une nouvelle version (caches de prétraitement et de profils contournés),
+les caches par contenu (corrélations) et par requête ainsi que les canevas
+sont vidés, et les analyses utilisent un DataAnalyzer neuf (cache de
+résultats vide). Seuls les imports différés et l'automate des mots-clés
+restent chargés d'une mesure à l'autre. La comparaison signale les étapes
+dont la médiane a augmenté de plus de --threshold et se termine avec le
+code 1 en cas de régression.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+# Rendu sans affichage, comme analysis.headless
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+from analysis import correlation
+from analysis.column_index import _cached_index
+from analysis.data_analyzer import DataAnalyzer
+from analysis.dtypes import numeric_columns, optimize_dtypes, text_columns
+from analysis.query_parser import _parse
+from analysis.search_index import SearchIndex
+from analysis.visualization import Visualizer
+from benchmarks.generator import add_arguments, generate_workbook, generator_options
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Termes recherchés : fréquent, rare, absent, numérique
+SEARCH_TERMS = ['paris', 'lyon q', 'introuvable', '12']
+
+# Méthodes de rendu mesurées (toutes les Visualizer._create_*)
+CHART_METHODS = {
+    'basic': '_create_basic_visualizations',
+    'pie': '_create_pie_chart',
+    'bar': '_create_bar_chart',
+    'line': '_create_line_chart',
+    'scatter': '_create_scatter_plot',
+    'box': '_create_box_plot',
+    'correlation': '_create_correlation_matrix',
+    'comparison': '_create_comparison_visualizations',
+    'distribution': '_create_distribution_visualizations'
+}
+
+
+def measure(func, repeat, setup=None):
+    """
+    Durées (en secondes) de `repeat` appels à func(*setup()) ; seul l'appel est chronométré
+    """
+    runs = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        runs.append(time.perf_counter() - start)
+    return {'median': statistics.median(runs), 'min': min(runs), 'runs': runs}
+
+
+def _fresh(df):
+    # Caches par contenu ou par requête vidés : une copie de même contenu les retrouverait
+    with correlation._matrices_lock:
+        correlation._matrices.clear()
+    _cached_index.cache_clear()
+    _parse.cache_clear()
+    # Nouvelle version des données (copie superficielle) : caches par version contournés
+    return df.copy(deep=False)
+
+
+def naive_search(df, term):
+    """
+    Recherche par masque sur toutes les colonnes, telle que faite avant l'index
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        mask |= df[col].astype(str).str.lower().str.contains(term, regex=False).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def chart_columns(df):
+    """
+    Colonnes passées à chaque méthode de rendu
+    """
+    texts, numbers = text_columns(df), numeric_columns(df)
+    if len(texts) < 2 or len(numbers) < 2:
+        raise ValueError("Le classeur doit avoir au moins deux colonnes textuelles et deux numériques")
+    return {
+        'basic': [texts[0], numbers[0]],
+        'pie': [texts[0]],
+        'bar': [texts[0]],
+        'line': numbers[:2],
+        'scatter': numbers[:2],
+        'box': numbers,
+        'correlation': numbers,
+        'comparison': texts[:2],
+        'distribution': numbers[:3]
+    }
+
+
+def analysis_queries(df):
+    """
+    Requêtes analysées : une par grand type de graphique
+    """
+    texts, numbers = text_columns(df), numeric_columns(df)
+    return [
+        f"répartition de {texts[0]}",
+        f"nombre par {texts[1]}",
+        f"comparer {texts[0]} et {texts[1]}",
+        f"évolution de {numbers[0]}",
+        f"nuage de points {numbers[0]} versus {numbers[1]}"
+    ]
+
+
+def run(path, repeat=5):
+    """
+    Mesure toutes les étapes sur le classeur `path` ; renvoie {étape: mesures}
+    """
+    results = {}
+    results['import.read_excel'] = measure(lambda: pd.read_excel(path), repeat)
+    df = pd.read_excel(path)
+    results['import.optimize_dtypes'] = measure(optimize_dtypes, repeat, lambda: (_fresh(df),))
+
+    results['search.build_index'] = measure(SearchIndex, repeat, lambda: (df,))
+    for term in SEARCH_TERMS:
+        results[f'search.index[{term}]'] = measure(
+            lambda index, term=term: index.search(term), repeat, lambda: (SearchIndex(df),)
+        )
+        results[f'search.mask[{term}]'] = measure(naive_search, repeat, lambda term=term: (df, term))
+
+    # Imports différés (scikit-learn, seaborn) effectués hors mesure
+    DataAnalyzer().analyze(_fresh(df), analysis_queries(df)[0])
+
+    results['analysis.get_suggestions'] = measure(
+        lambda analyzer, data: analyzer.get_suggestions(data), repeat, lambda: (DataAnalyzer(), _fresh(df))
+    )
+    for query in analysis_queries(df):
+        results[f'analysis.analyze[{query}]'] = measure(
+            lambda analyzer, data, query=query: analyzer.analyze(data, query),
+            repeat,
+            lambda: (DataAnalyzer(), _fresh(df))
+        )
+
+    visualizer = Visualizer()
+    visualizer._seaborn()
+    for chart, columns in chart_columns(df).items():
+        method = getattr(visualizer, CHART_METHODS[chart])
+
+        def setup():
+            # Canevas vidé : pas de mise à jour en place d'un graphique précédent
+            visualizer._canvases.clear()
+            return (_fresh(df),)
+
+        results[f'render.{chart}'] = measure(
+            lambda data, method=method, columns=columns: method(data, columns, None), repeat, setup
+        )
+    return results
+
+
+def environment():
+    """
+    Versions et révision mesurées, pour interpréter une comparaison
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'commit': commit,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compare deux résultats ; renvoie les lignes (étape, avant, après, rapport, régression)
+    """
+    rows = []
+    for stage, measures in current['stages'].items():
+        if stage not in baseline['stages']:
+            continue
+        before = baseline['stages'][stage]['median']
+        after = measures['median']
+        ratio = after / before if before else float('inf')
+        rows.append((stage, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_results(result):
+    for stage, measures in result['stages'].items():
+        print(f"{stage:<60} {measures['median'] * 1000:10.1f} ms  (min {measures['min'] * 1000:.1f})")
+
+
+def print_comparison(rows):
+    for stage, before, after, ratio, regression in rows:
+        flag = '  RÉGRESSION' if regression else ''
+        print(f"{stage:<60} {before * 1000:10.1f} → {after * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} régression(s) sur {len(rows)} étape(s) comparée(s)")
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durée des étapes du traitement sur un classeur synthétique")
+    add_arguments(parser)
+    parser.add_argument('--workbook', help="Classeur existant à mesurer (au lieu d'un classeur généré)")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures par étape")
+    parser.add_argument('--json', help="Fichier où enregistrer les résultats")
+    parser.add_argument('--baseline', help="Résultats de référence auxquels comparer cette mesure")
+    parser.add_argument('--compare', nargs=2, metavar=('REFERENCE', 'RESULTATS'),
+                        help="Compare deux fichiers de résultats sans rien mesurer")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Hausse relative de la médiane considérée comme une régression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = map(_load, args.compare)
+        return 1 if print_comparison(compare(baseline, current, args.threshold)) else 0
+
+    options = generator_options(args)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.workbook
+        if path is None:
+            path = generate_workbook(os.path.join(tmp_dir, 'benchmark.xlsx'), **options)
+        stages = run(path, repeat=args.repeat)
+
+    result = {
+        'environment': environment(),
+        'parameters': {'workbook': args.workbook} if args.workbook else options,
+        'repeat': args.repeat,
+        'stages': stages
+    }
+    print_results(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        print()
+        return 1 if print_comparison(compare(_load(args.baseline), result, args.threshold)) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Mesure du temps de lancement : délai jusqu'à l'affichage de la première
+fenêtre et modules les plus coûteux à importer (python -X importtime).
+
+    python -m benchmarks.startup [--repeat 5] [--top 15] [--json resultats.json]
+
+Chaque mesure est faite dans un nouveau processus, comme un vrai lancement.
+Sans affichage disponible, seule la durée des imports est mesurée.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code exécuté dans le processus mesuré : mêmes étapes que main.run_gui
+_CHILD = """
+import sys, time
+import customtkinter as ctk
+from gui.main_window import MainWindow
+imported = time.perf_counter()
+try:
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("blue")
+    app = MainWindow()
+    app.update()
+except Exception as e:
+    print(f"window-error {e}", file=sys.stderr)
+    window = None
+else:
+    window = time.perf_counter()
+    app.destroy()
+print(imported, window)
+"""
+
+
+def measure_once():
+    """
+    Lance un processus et renvoie (durées en secondes, sortie de -X importtime)
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imported, window = process.stdout.split()[-2:]
+    timings = {'imports': float(imported) - start}
+    if window != 'None':
+        timings['first_window'] = float(window) - start
+    return timings, process.stderr
+
+
+def parse_importtime(output, top=15):
+    """
+    Paquets les plus coûteux à importer (durée cumulée de leur import le plus long, en secondes)
+    """
+    packages = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = max(packages.get(package, 0), int(cumulative) / 1e6)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temps de lancement de l'application")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de lancements mesurés")
+    parser.add_argument('--top', type=int, default=15, help="Nombre de modules affichés")
+    parser.add_argument('--json', help="Fichier où enregistrer les résultats")
+    args = parser.parse_args(argv)
+
+    runs, importtime = [], ''
+    for _ in range(args.repeat):
+        timings, importtime = measure_once()
+        runs.append(timings)
+
+    summary = {
+        name: statistics.median(run[name] for run in runs)
+        for name in ('imports', 'first_window')
+        if all(name in run for run in runs)
+    }
+    result = {
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'median': summary,
+        'slowest_imports': parse_importtime(importtime, args.top)
+    }
+
+    for name, seconds in summary.items():
+        print(f"{name:>14} : {seconds * 1000:8.1f} ms (médiane sur {len(runs)})")
+    if 'first_window' not in summary:
+        print("    (pas d'affichage : délai jusqu'à la première fenêtre non mesuré)")
+    print("\nImports les plus coûteux :")
+    for module, seconds in result['slowest_imports']:
+        print(f"  {seconds * 1000:8.1f} ms  {module}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
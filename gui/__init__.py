@@ -1,4 +1,3 @@
 from .main_window import MainWindow
-import nltk
 
 __all__ = ['MainWindow']
\ No newline at end of file
@@ -0,0 +1,185 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Levée dans une tâche lorsque son annulation a été demandée"""
+
+
+class JobContext:
+    """
+    Objet transmis à chaque tâche pour signaler sa progression
+    et vérifier si elle a été annulée
+    """
+
+    def __init__(self, job, events):
+        self._job = job
+        self._events = events
+
+    @property
+    def cancelled(self):
+        return self._job.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """
+        Interrompt la tâche si son annulation a été demandée
+        """
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(self, fraction, message=None):
+        """
+        Signale l'avancement (entre 0 et 1) ; sert aussi de point d'annulation
+        """
+        self.check_cancelled()
+        self._events.put(('progress', self._job, (max(0.0, min(1.0, fraction)), message)))
+
+
+class Job:
+    """Tâche soumise au planificateur"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, kind, func, args, kwargs, on_success, on_error):
+        self.id = next(self._ids)
+        self.kind = kind
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class JobScheduler:
+    """
+    Exécute les tâches longues (import, recherche, analyse) hors de la boucle Tk.
+
+    Les tâches tournent dans un pool de threads ; leurs résultats et leur
+    progression reviennent au thread Tk par une file lue périodiquement avec
+    `after()`. Pour un même type de tâche, seule la dernière soumise est
+    conservée : les précédentes sont annulées et leurs résultats ignorés.
+    """
+
+    def __init__(self, root, max_workers=2, on_progress=None, on_idle=None, poll_interval=50):
+        self.root = root
+        self.on_progress = on_progress
+        self.on_idle = on_idle
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._events = queue.Queue()
+        self._latest = {}
+        self._closed = False
+        self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def submit(self, kind, func, *args, on_success=None, on_error=None, **kwargs):
+        """
+        Soumet une tâche `func(context, *args, **kwargs)` et annule la précédente du même type
+        """
+        previous = self._latest.get(kind)
+        if previous is not None:
+            previous.cancel()
+
+        job = Job(kind, func, args, kwargs, on_success, on_error)
+        self._latest[kind] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def cancel(self, kind=None):
+        """
+        Annule la tâche en cours d'un type donné, ou toutes les tâches
+        """
+        kinds = [kind] if kind is not None else list(self._latest)
+        for k in kinds:
+            job = self._latest.pop(k, None)
+            if job is not None:
+                job.cancel()
+        self._notify_idle()
+
+    def shutdown(self):
+        """
+        Annule les tâches et arrête le pool sans attendre la fin des calculs
+        """
+        self._closed = True
+        for job in self._latest.values():
+            job.cancel()
+        self._latest.clear()
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        """
+        Corps exécuté dans le thread de travail
+        """
+        if job.cancel_event.is_set():
+            self._events.put(('cancelled', job, None))
+            return
+        context = JobContext(job, self._events)
+        try:
+            result = job.func(context, *job.args, **job.kwargs)
+            context.check_cancelled()
+        except JobCancelled:
+            self._events.put(('cancelled', job, None))
+        except Exception as e:
+            self._events.put(('error', job, e))
+        else:
+            self._events.put(('done', job, result))
+
+    def _is_current(self, job):
+        return self._latest.get(job.kind) is job and not job.cancel_event.is_set()
+
+    def _poll(self):
+        """
+        Traite, dans le thread Tk, les événements émis par les tâches
+        """
+        self._poll_id = None
+        if self._closed:
+            return
+        try:
+            self._process_events()
+        finally:
+            # Une erreur dans un callback ne doit pas arrêter la lecture de la file
+            if not self._closed:
+                try:
+                    self._poll_id = self.root.after(self.poll_interval, self._poll)
+                except Exception:
+                    # Fenêtre détruite
+                    self._poll_id = None
+
+    def _process_events(self):
+        while True:
+            try:
+                event, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+            if event == 'progress':
+                if self._is_current(job) and self.on_progress is not None:
+                    fraction, message = payload
+                    self.on_progress(job, fraction, message)
+                continue
+
+            # Les résultats d'une tâche remplacée ou annulée sont ignorés
+            if not self._is_current(job):
+                continue
+            del self._latest[job.kind]
+            self._notify_idle()
+
+            if event == 'done' and job.on_success is not None:
+                job.on_success(payload)
+            elif event == 'error' and job.on_error is not None:
+                job.on_error(payload)
+
+    def _notify_idle(self):
+        if not self._latest and self.on_idle is not None:
+            self.on_idle()
@@ -1,22 +1,53 @@
 import customtkinter as ctk
 from tkinter import filedialog, ttk
-import pandas as pd
 from analysis.data_analyzer import DataAnalyzer
-from analysis.visualization import Visualizer
+from analysis.import_cache import ImportCache
+from analysis.search_index import SearchIndex
+from analysis.workbook import Workbook
+from analysis.multi_import import read_files
+from analysis.profiling import profile_dataframe
+from analysis.result_cache import ResultCache
+from analysis.dtypes import format_bytes
+from analysis import tracing
+from gui.job_scheduler import JobScheduler
+from gui.trace_panel import TracePanel
+from gui.virtual_table import VirtualTable
 import os
 
 class MainWindow(ctk.CTk):
+    # Délai d'inactivité avant de lancer la recherche pendant la saisie
+    SEARCH_DEBOUNCE_MS = 250
+    # Nombre de suggestions affichées à la fois
+    SUGGESTIONS_BATCH_SIZE = 20
+    
     def __init__(self):
         super().__init__()
         
-        self.data_analyzer = DataAnalyzer()
-        self.visualizer = Visualizer()
+        # Analyses et graphiques déjà calculés, conservés d'une session à l'autre
+        self.result_cache = ResultCache(persist=True)
+        self.data_analyzer = DataAnalyzer(result_cache=self.result_cache)
+        self._visualizer = None
+        self._memory_text = ""
+        self.import_cache = ImportCache()
+        self.workbook = None
+        self.search_index = None
         self.df = None
+        self._search_after_id = None
+        self._pending_suggestions = []
+        self._more_suggestions_button = None
         
         self._create_widgets()
         self._create_layout()
         self._setup_theme()
         
+        # Les traitements longs sont exécutés hors de la boucle Tk
+        self.scheduler = JobScheduler(
+            self,
+            on_progress=self._on_job_progress,
+            on_idle=self._on_jobs_idle
+        )
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
     def _setup_theme(self):
         """Configure le thème de l'application"""
         # Configuration des couleurs
@@ -55,6 +86,18 @@ class MainWindow(ctk.CTk):
             height=40
         )
         
+        # Choix de la feuille du classeur importé
+        self.sheet_selector = ctk.CTkOptionMenu(
+            self.main_frame,
+            values=["Aucune feuille"],
+            command=self._on_sheet_selected,
+            state="disabled"
+        )
+        self.memory_label = ctk.CTkLabel(
+            self.main_frame,
+            text=""
+        )
+        
         # Frame pour la recherche
         self.search_frame = ctk.CTkFrame(self.main_frame)
         
@@ -81,18 +124,10 @@ class MainWindow(ctk.CTk):
             self.search_results_frame,
             text="📊 Résultats de la recherche :"
         )
-        self.search_results_tree = ttk.Treeview(
-            self.search_results_frame,
-            columns=[],
-            show='headings',
-            height=5
-        )
-        self.search_results_scrollbar = ttk.Scrollbar(
+        self.search_results_table = VirtualTable(
             self.search_results_frame,
-            orient="vertical",
-            command=self.search_results_tree.yview
+            visible_rows=10
         )
-        self.search_results_tree.configure(yscrollcommand=self.search_results_scrollbar.set)
         
         # Frame pour les suggestions
         self.suggestions_frame = ctk.CTkFrame(self.tab_analysis)
@@ -115,6 +150,12 @@ class MainWindow(ctk.CTk):
             self.query_frame,
             height=100
         )
+        # Mode SQL : la requête est exécutée telle quelle sur la table « donnees »
+        self.sql_switch = ctk.CTkSwitch(
+            self.query_frame,
+            text="Requête SQL (table « donnees »)",
+            command=self._on_sql_mode
+        )
         
         # Bouton d'analyse
         self.analyze_button = ctk.CTkButton(
@@ -127,13 +168,41 @@ class MainWindow(ctk.CTk):
         # Zone d'affichage des graphiques
         self.plot_frame = ctk.CTkFrame(self.tab_visualization)
         
+        # Barre d'état : progression et annulation des traitements
+        self.status_frame = ctk.CTkFrame(self)
+        self.status_label = ctk.CTkLabel(
+            self.status_frame,
+            text="Prêt"
+        )
+        self.progress_bar = ctk.CTkProgressBar(self.status_frame)
+        self.progress_bar.set(0)
+        self.cancel_button = ctk.CTkButton(
+            self.status_frame,
+            text="Annuler",
+            command=self._cancel_jobs,
+            width=100,
+            state="disabled"
+        )
+        
+        # Détail des durées et de la mémoire par étape (replié par défaut)
+        self.trace_panel = TracePanel(self)
+        
     def _create_layout(self):
+        # Layout de la barre d'état (placée avant les onglets pour rester visible)
+        self.status_frame.pack(side="bottom", fill="x", padx=20, pady=(0, 10))
+        self.status_label.pack(side="left", padx=10)
+        self.cancel_button.pack(side="right", padx=10, pady=5)
+        self.progress_bar.pack(side="right", fill="x", expand=True, padx=10)
+        self.trace_panel.pack(side="bottom", fill="x", padx=20, pady=(0, 5))
+        
         # Layout des onglets
         self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Layout de l'onglet Données
         self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
         self.import_button.pack(pady=10)
+        self.sheet_selector.pack(pady=(0, 10))
+        self.memory_label.pack()
         
         # Layout de la recherche
         self.search_frame.pack(fill="x", padx=20, pady=10)
@@ -141,11 +210,14 @@ class MainWindow(ctk.CTk):
         self.search_entry.pack(side="left", fill="x", expand=True, padx=5)
         self.search_button.pack(side="left", padx=5)
         
+        # Recherche pendant la saisie
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
+        self.search_entry.bind("<Return>", lambda e: self._search_data())
+        
         # Layout des résultats de recherche
         self.search_results_frame.pack(fill="x", padx=20, pady=10)
         self.search_results_label.pack(anchor="w", pady=5)
-        self.search_results_tree.pack(side="left", fill="both", expand=True)
-        self.search_results_scrollbar.pack(side="right", fill="y")
+        self.search_results_table.pack(fill="both", expand=True)
         
         # Layout de l'onglet Analyse
         self.suggestions_frame.pack(fill="x", padx=20, pady=10)
@@ -155,76 +227,201 @@ class MainWindow(ctk.CTk):
         self.query_frame.pack(fill="x", padx=20, pady=10)
         self.query_label.pack(pady=(20,5))
         self.query_text.pack(fill="x", padx=20)
+        self.sql_switch.pack(anchor="w", padx=20, pady=(5, 0))
         self.analyze_button.pack(pady=10)
         
         # Layout de l'onglet Visualisation
         self.plot_frame.pack(fill="both", expand=True, pady=20)
         
     def _import_excel(self):
-        file_path = filedialog.askopenfilename(
+        file_paths = filedialog.askopenfilenames(
             filetypes=[("Excel files", "*.xlsx *.xls")]
         )
-        if file_path:
-            try:
-                self.df = pd.read_excel(file_path)
-                self.import_button.configure(
-                    text=f"📂 Fichier importé : {os.path.basename(file_path)}"
-                )
-                self._setup_search_results_table()
-                self._update_suggestions()
-            except Exception as e:
-                self._show_error(f"Erreur lors de l'import : {str(e)}")
-                
+        if len(file_paths) > 1:
+            # Plusieurs fichiers (par exemple un rapport mensuel) : réunis en une seule table
+            self.scheduler.submit(
+                'import',
+                self._load_files,
+                list(file_paths),
+                on_success=self._on_files_loaded,
+                on_error=lambda e: self._show_error(f"Erreur lors de l'import : {str(e)}")
+            )
+        elif file_paths:
+            file_path = file_paths[0]
+            self.scheduler.submit(
+                'import',
+                self._load_workbook,
+                file_path,
+                on_success=lambda result: self._on_import_done(file_path, result),
+                on_error=lambda e: self._show_error(f"Erreur lors de l'import : {str(e)}")
+            )
+            
+    def _load_workbook(self, job, file_path):
+        """Liste les feuilles du classeur et charge la première (exécuté en arrière-plan)"""
+        job.report(0.05, f"Ouverture de {os.path.basename(file_path)}...")
+        with tracing.span('import', file=os.path.basename(file_path)):
+            with tracing.span('list_sheets'):
+                workbook = Workbook(file_path, cache=self.import_cache)
+            return (workbook,) + self._load_sheet(job, workbook, workbook.sheet_names[0])
+        
+    def _load_files(self, job, file_paths):
+        """Lit plusieurs classeurs en parallèle et les réunit (exécuté en arrière-plan)"""
+        with tracing.span('import', files=len(file_paths)) as span:
+            df, memory = read_files(
+                file_paths,
+                cache=self.import_cache,
+                progress=lambda fraction, message=None: job.report(0.05 + 0.55 * fraction, message)
+            )
+            span.set(rows=len(df), columns=df.shape[1])
+            label = f"{len(file_paths)} fichiers"
+            return (label, df) + self._prepare_data(job, df) + (memory,)
+        
+    def _load_sheet(self, job, workbook, sheet_name):
+        """Lit une feuille et prépare la recherche et les suggestions (exécuté en arrière-plan)"""
+        with tracing.span('load_sheet', sheet=sheet_name) as span:
+            job.report(0.1, f"Import de la feuille {sheet_name}...")
+            with tracing.span('read'):
+                df = workbook.sheet(sheet_name)
+            span.set(rows=len(df), columns=df.shape[1])
+            return (sheet_name, df) + self._prepare_data(job, df) + (workbook.memory_report(sheet_name),)
+        
+    def _prepare_data(self, job, df):
+        """Index de recherche, profils et suggestions des données importées ; renvoie (index, suggestions)"""
+        job.report(0.6, "Indexation pour la recherche...")
+        with tracing.span('search_index'):
+            search_index = SearchIndex(df)
+        job.report(0.8, "Profilage des colonnes...")
+        with tracing.span('profile'):
+            profile_dataframe(df)
+        job.report(0.9, "Recherche de suggestions...")
+        with tracing.span('suggestions'):
+            suggestions = self.data_analyzer.get_suggestions(df)
+        job.report(1.0, "Import terminé")
+        return search_index, suggestions
+        
+    def _on_import_done(self, file_path, result):
+        """Met à jour l'interface une fois le classeur ouvert"""
+        self.workbook = result[0]
+        self.sheet_selector.configure(values=self.workbook.sheet_names, state="normal")
+        self._on_sheet_loaded(result[1:])
+        
+    def _on_files_loaded(self, result):
+        """Met à jour l'interface une fois plusieurs fichiers réunis"""
+        # Une seule table : pas de feuille à choisir
+        self.workbook = None
+        self.sheet_selector.configure(values=[result[0]], state="disabled")
+        self._on_sheet_loaded(result)
+        
+    def _on_sheet_selected(self, sheet_name):
+        """Charge en arrière-plan la feuille choisie ; les autres restent non lues"""
+        if self.workbook is None:
+            return
+        self.scheduler.submit(
+            'import',
+            self._load_sheet,
+            self.workbook,
+            sheet_name,
+            on_success=self._on_sheet_loaded,
+            on_error=lambda e: self._show_error(f"Erreur lors de l'import : {str(e)}")
+        )
+        
+    def _on_sheet_loaded(self, result):
+        """Affiche la feuille chargée"""
+        sheet_name, self.df, self.search_index, suggestions, memory = result
+        self.sheet_selector.set(sheet_name)
+        self._memory_text = f"💾 Mémoire : {memory} (types compacts)" if memory is not None else ""
+        self._update_memory_label()
+        if self.workbook is not None:
+            self.import_button.configure(
+                text=f"📂 Fichier importé : {os.path.basename(self.workbook.file_path)} ({sheet_name})"
+            )
+        else:
+            self.import_button.configure(text=f"📂 Fichiers importés : {sheet_name} réunis")
+        self._setup_search_results_table()
+        self._update_suggestions(suggestions)
+        
     def _setup_search_results_table(self):
         """Configure le tableau de résultats de recherche"""
         if self.df is not None:
             # Configuration des colonnes
-            self.search_results_tree['columns'] = list(self.df.columns)
-            for col in self.df.columns:
-                self.search_results_tree.heading(col, text=col)
-                self.search_results_tree.column(col, width=100)
+            self.search_results_table.set_columns(self.df.columns)
+            self.search_results_label.configure(text="📊 Résultats de la recherche :")
                 
-    def _search_data(self):
+    def _on_search_key(self, event):
+        """Relance la recherche après une courte pause dans la saisie"""
+        if event.keysym == "Return":
+            return
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(
+            self.SEARCH_DEBOUNCE_MS,
+            lambda: self._search_data(live=True)
+        )
+        
+    def _search_data(self, live=False):
         """Effectue la recherche dans les données"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+            
         if self.df is None:
-            self._show_error("Veuillez d'abord importer un fichier Excel")
+            if not live:
+                self._show_error("Veuillez d'abord importer un fichier Excel")
             return
             
         search_term = self.search_entry.get().lower()
         if not search_term:
+            self.scheduler.cancel('search')
+            self._show_search_results([])
             return
             
-        # Effacer les résultats précédents
-        for item in self.search_results_tree.get_children():
-            self.search_results_tree.delete(item)
-            
-        # Recherche dans toutes les colonnes
-        mask = pd.DataFrame(False, index=self.df.index, columns=['match'])
-        for col in self.df.columns:
-            if self.df[col].dtype == 'object':
-                mask['match'] |= self.df[col].astype(str).str.lower().str.contains(search_term)
-            else:
-                mask['match'] |= self.df[col].astype(str).str.contains(search_term)
-                
-        # Affichage des résultats
-        results = self.df[mask['match']]
-        for _, row in results.iterrows():
-            self.search_results_tree.insert('', 'end', values=list(row))
+        self.scheduler.submit(
+            'search',
+            self._find_matches,
+            self.df,
+            self.search_index,
+            search_term,
+            on_success=self._show_search_results,
+            on_error=lambda e: self._show_error(f"Erreur lors de la recherche : {str(e)}")
+        )
+        
+    def _find_matches(self, job, df, search_index, search_term):
+        """Calcule les lignes correspondant à la recherche (exécuté en arrière-plan)"""
+        job.report(0.0, "Recherche en cours...")
+        with tracing.span('search', term=search_term) as span:
+            positions = search_index.search(search_term)
+            span.set(matches=len(positions))
+        return positions
+        
+    def _show_search_results(self, positions):
+        """Affiche les résultats de recherche dans le tableau"""
+        # Seules les lignes visibles sont lues dans le DataFrame
+        self.search_results_table.set_rows(self.df, positions)
+        self.search_results_label.configure(
+            text=f"📊 Résultats de la recherche : {len(positions)} ligne(s)"
+        )
             
-    def _update_suggestions(self):
+    def _update_suggestions(self, suggestions):
         """Met à jour les suggestions d'analyse"""
         # Nettoyage des suggestions précédentes
         for widget in self.suggestions_list.winfo_children():
             widget.destroy()
             
-        if self.df is None:
-            return
+        self._pending_suggestions = list(suggestions) if self.df is not None else []
+        self._more_suggestions_button = None
+        self._show_more_suggestions()
+        
+    def _show_more_suggestions(self):
+        """Affiche le lot suivant de suggestions (création des widgets à la demande)"""
+        if self._more_suggestions_button is not None:
+            self._more_suggestions_button.destroy()
+            self._more_suggestions_button = None
             
-        # Récupération des suggestions
-        suggestions = self.data_analyzer.get_suggestions(self.df)
+        batch = self._pending_suggestions[:self.SUGGESTIONS_BATCH_SIZE]
+        self._pending_suggestions = self._pending_suggestions[self.SUGGESTIONS_BATCH_SIZE:]
         
         # Création des boutons de suggestion
-        for suggestion in suggestions:
+        for suggestion in batch:
             suggestion_frame = ctk.CTkFrame(self.suggestions_list)
             suggestion_frame.pack(fill="x", padx=5, pady=2)
             
@@ -249,6 +446,16 @@ class MainWindow(ctk.CTk):
             )
             button.pack(anchor="e", padx=5, pady=2)
             
+        if self._pending_suggestions:
+            self._more_suggestions_button = ctk.CTkButton(
+                self.suggestions_list,
+                text=f"Afficher plus de suggestions ({len(self._pending_suggestions)} restantes)",
+                command=self._show_more_suggestions,
+                fg_color="transparent",
+                border_width=1
+            )
+            self._more_suggestions_button.pack(pady=5)
+            
     def _apply_suggestion(self, suggestion):
         """Applique une suggestion d'analyse"""
         # Mise à jour de la zone de texte
@@ -268,9 +475,43 @@ class MainWindow(ctk.CTk):
             self._show_error("Veuillez entrer une requête d'analyse")
             return
             
+        self.scheduler.submit(
+            'analysis',
+            self._run_sql if self.sql_switch.get() else self._run_analysis,
+            self.df,
+            query,
+            on_success=self._show_analysis,
+            on_error=lambda e: self._show_error(f"Erreur lors de l'analyse : {str(e)}")
+        )
+        
+    @property
+    def visualizer(self):
+        """Visualiseur créé à la première analyse (matplotlib est long à importer)"""
+        if self._visualizer is None:
+            from analysis.visualization import Visualizer
+            self._visualizer = Visualizer(result_cache=self.result_cache)
+        return self._visualizer
+        
+    def _run_analysis(self, job, df, query):
+        """Analyse des données (exécutée en arrière-plan)"""
+        return self.data_analyzer.analyze(df, query, progress=job.report)
+        
+    def _run_sql(self, job, df, query):
+        """Requête SQL sur les données (exécutée en arrière-plan)"""
+        job.report(0.0, "Exécution de la requête SQL...")
+        # La base est chargée à la première requête sur ces données, puis réutilisée
+        return self.data_analyzer.analyze_sql(df, query, should_stop=lambda: job.cancelled)
+        
+    def _on_sql_mode(self):
+        """Adapte la consigne au mode de requête choisi"""
+        if self.sql_switch.get():
+            self.query_label.configure(text='❓ Entrez votre requête SQL (ex. SELECT "Région", SUM("Ventes") FROM donnees GROUP BY 1) :')
+        else:
+            self.query_label.configure(text="❓ Entrez votre requête d'analyse :")
+            
+    def _show_analysis(self, analysis_results):
+        """Génère les visualisations dans le thread Tk"""
         try:
-            # Analyse des données
-            analysis_results = self.data_analyzer.analyze(self.df, query)
             chart_type = analysis_results.get('chart_type')
             
             # Génération des visualisations
@@ -280,9 +521,44 @@ class MainWindow(ctk.CTk):
                 self.plot_frame,
                 chart_type=chart_type
             )
+            self._update_memory_label()
         except Exception as e:
             self._show_error(f"Erreur lors de l'analyse : {str(e)}")
             
+    def _update_memory_label(self):
+        """Mémoire des données et efficacité du cache des résultats"""
+        stats = self.result_cache.stats()
+        parts = [self._memory_text] if self._memory_text else []
+        if stats['hits'] + stats['misses']:
+            parts.append(
+                f"♻️ Cache : {stats['hits']} réutilisés / {stats['misses']} calculés "
+                f"({format_bytes(stats['bytes'])})"
+            )
+        self.memory_label.configure(text="  ·  ".join(parts))
+            
+    def _on_job_progress(self, job, fraction, message):
+        """Affiche la progression de la tâche en cours"""
+        self.progress_bar.set(fraction)
+        if message:
+            self.status_label.configure(text=message)
+        self.cancel_button.configure(state="normal")
+        
+    def _on_jobs_idle(self):
+        """Réinitialise la barre d'état lorsque plus aucune tâche n'est active"""
+        self.progress_bar.set(0)
+        self.status_label.configure(text="Prêt")
+        self.cancel_button.configure(state="disabled")
+        
+    def _cancel_jobs(self):
+        """Annule les traitements en cours"""
+        self.scheduler.cancel()
+        self.status_label.configure(text="Traitement annulé")
+        
+    def _on_close(self):
+        """Arrête les traitements en arrière-plan avant de fermer la fenêtre"""
+        self.scheduler.shutdown()
+        self.destroy()
+        
     def _show_error(self, message):
         """Affiche une fenêtre d'erreur stylisée"""
         error_window = ctk.CTkToplevel(self)
@@ -0,0 +1,119 @@
+import queue
+
+import customtkinter as ctk
+
+from analysis import tracing
+
+
+class TracePanel(ctk.CTkFrame):
+    """
+    Panneau repliable affichant la durée, le temps CPU et le pic de mémoire
+    de chaque étape des derniers traitements (import, recherche, analyse, rendu).
+
+    Les étapes terminées dans les threads de travail arrivent par une file
+    lue avec `after()` ; la lecture n'a lieu que lorsque les mesures sont actives.
+    """
+
+    # Nombre de traitements affichés
+    MAX_TRACES = 10
+
+    def __init__(self, master, poll_interval=250, **kwargs):
+        super().__init__(master, **kwargs)
+        self.poll_interval = poll_interval
+        self._spans = queue.SimpleQueue()
+        self._traces = list(tracing.recent())[-self.MAX_TRACES:]
+        self._expanded = False
+        self._poll_id = None
+
+        self.header = ctk.CTkFrame(self, fg_color="transparent")
+        self.toggle_button = ctk.CTkButton(
+            self.header,
+            text="▸ Détail des traitements",
+            command=self.toggle,
+            fg_color="transparent",
+            anchor="w",
+            width=200
+        )
+        self.enable_switch = ctk.CTkSwitch(
+            self.header,
+            text="Mesurer",
+            command=self._on_switch
+        )
+        self.textbox = ctk.CTkTextbox(
+            self,
+            height=160,
+            font=("Courier", 11),
+            wrap="none"
+        )
+
+        self.header.pack(fill="x")
+        self.toggle_button.pack(side="left", padx=5)
+        self.enable_switch.pack(side="right", padx=10)
+
+        tracing.add_listener(self._spans.put)
+        if tracing.is_enabled():
+            self.enable_switch.select()
+            self._start_polling()
+
+    def toggle(self):
+        """Affiche ou masque le détail"""
+        self._expanded = not self._expanded
+        if self._expanded:
+            self.toggle_button.configure(text="▾ Détail des traitements")
+            self.textbox.pack(fill="x", padx=5, pady=(0, 5))
+            self._refresh()
+        else:
+            self.toggle_button.configure(text="▸ Détail des traitements")
+            self.textbox.pack_forget()
+
+    def destroy(self):
+        tracing.remove_listener(self._spans.put)
+        self._stop_polling()
+        super().destroy()
+
+    def _on_switch(self):
+        """Active ou désactive les mesures (sans fichier de trace s'il n'y en a pas déjà un)"""
+        if self.enable_switch.get():
+            tracing.enable(sink=tracing.sink())
+            self._start_polling()
+        else:
+            tracing.disable()
+            self._stop_polling()
+
+    def _start_polling(self):
+        if self._poll_id is None:
+            self._poll_id = self.after(self.poll_interval, self._poll)
+
+    def _stop_polling(self):
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _poll(self):
+        """Récupère les étapes terminées depuis la dernière lecture"""
+        received = False
+        while True:
+            try:
+                self._traces.append(self._spans.get_nowait())
+            except queue.Empty:
+                break
+            received = True
+        if received:
+            del self._traces[:-self.MAX_TRACES]
+            self._refresh()
+        self._poll_id = self.after(self.poll_interval, self._poll)
+
+    def _refresh(self):
+        if not self._expanded:
+            return
+        lines = []
+        # Le traitement le plus récent en premier
+        for span in reversed(self._traces):
+            lines.extend(tracing.format_span(span))
+            lines.append("")
+        if not lines:
+            lines = ["Aucune mesure : activez « Mesurer » puis lancez un traitement."]
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", "\n".join(lines))
+        self.textbox.configure(state="disabled")
@@ -0,0 +1,190 @@
+import customtkinter as ctk
+from tkinter import ttk
+import numpy as np
+
+
+class VirtualTable(ctk.CTkFrame):
+    """
+    Tableau virtualisé : seules les lignes visibles sont insérées dans le Treeview.
+
+    Les données restent dans le DataFrame d'origine ; le tableau ne conserve
+    qu'un tableau de positions (résultat de recherche, éventuellement trié) et
+    lit les lignes affichées à la demande lors du défilement, avec une petite
+    marge pour éviter de relire le DataFrame à chaque cran de molette.
+    """
+
+    def __init__(self, master, visible_rows=10, buffer_rows=50, **kwargs):
+        super().__init__(master, **kwargs)
+
+        self.visible_rows = visible_rows
+        self.buffer_rows = buffer_rows
+
+        self._df = None
+        self._columns = []
+        self._positions = np.empty(0, dtype=np.int64)
+        self._offset = 0
+        self._sort_column = None
+        self._sort_ascending = True
+
+        # Lignes déjà lues : self._buffer[i] correspond à la position self._buffer_start + i
+        self._buffer_start = 0
+        self._buffer = []
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=[],
+            show='headings',
+            height=visible_rows
+        )
+        self.scrollbar = ttk.Scrollbar(
+            self,
+            orient="vertical",
+            command=self._on_scrollbar
+        )
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+
+    @property
+    def row_count(self):
+        """Nombre total de lignes du résultat"""
+        return len(self._positions)
+
+    def set_columns(self, columns):
+        """
+        Configure les colonnes affichées
+        """
+        self._columns = list(columns)
+        self._sort_column = None
+        self.tree['columns'] = [str(i) for i in range(len(self._columns))]
+        for i, col in enumerate(self._columns):
+            self.tree.heading(str(i), text=str(col), command=lambda i=i: self.sort_by(i))
+            self.tree.column(str(i), width=100)
+        self.set_rows(None, [])
+
+    def set_rows(self, df, positions):
+        """
+        Affiche les lignes `positions` (positions entières) de `df` sans les copier
+        """
+        self._df = df
+        self._positions = np.asarray(positions, dtype=np.int64)
+        self._offset = 0
+        self._buffer = []
+        if self._sort_column is not None and df is not None:
+            self._sort_positions()
+        self._refresh()
+
+    def scroll(self, rows):
+        """
+        Fait défiler le tableau de `rows` lignes
+        """
+        self._scroll_to(self._offset + rows)
+
+    def sort_by(self, column_index):
+        """
+        Trie le résultat sur une colonne ; un second clic inverse l'ordre
+        """
+        if self._df is None:
+            return
+        if self._sort_column == column_index:
+            self._sort_ascending = not self._sort_ascending
+        else:
+            self._sort_column = column_index
+            self._sort_ascending = True
+
+        self._sort_positions()
+        self._offset = 0
+        self._buffer = []
+        self._update_headings()
+        self._refresh()
+
+    def _sort_positions(self):
+        """
+        Réordonne les positions selon la colonne de tri, sans copier le DataFrame
+        """
+        keys = self._df.iloc[:, self._sort_column].take(self._positions).to_numpy()
+        try:
+            order = np.argsort(keys, kind='stable')
+        except TypeError:
+            # Colonne de types mélangés : tri sur la représentation texte
+            order = np.argsort(keys.astype(str), kind='stable')
+        if not self._sort_ascending:
+            order = order[::-1]
+        self._positions = self._positions[order]
+
+    def _update_headings(self):
+        for i, col in enumerate(self._columns):
+            text = str(col)
+            if i == self._sort_column:
+                text += " ▲" if self._sort_ascending else " ▼"
+            self.tree.heading(str(i), text=text)
+
+    def _scroll_to(self, offset):
+        max_offset = max(0, self.row_count - self.visible_rows)
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self._offset:
+            self._offset = offset
+            self._refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self._scroll_to(float(value) * self.row_count)
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        """
+        Adapte le nombre de lignes affichées à la hauteur du widget
+        """
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Retrait de la hauteur de l'en-tête
+        visible_rows = max(1, (event.height - row_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self._offset = max(0, min(self._offset, self.row_count - visible_rows))
+            self._refresh()
+
+    def _fetch(self, start, count):
+        """
+        Renvoie les lignes [start, start + count) en relisant le DataFrame si nécessaire
+        """
+        end = min(start + count, self.row_count)
+        buffer_end = self._buffer_start + len(self._buffer)
+        if start < self._buffer_start or end > buffer_end:
+            self._buffer_start = max(0, start - self.buffer_rows)
+            stop = min(self.row_count, end + self.buffer_rows)
+            block = self._df.iloc[self._positions[self._buffer_start:stop]]
+            block = block.astype(object).where(block.notna(), '')
+            self._buffer = list(block.itertuples(index=False, name=None))
+        return self._buffer[start - self._buffer_start:end - self._buffer_start]
+
+    def _refresh(self):
+        """
+        Met à jour les lignes visibles en réutilisant les éléments du Treeview
+        """
+        rows = self._fetch(self._offset, self.visible_rows) if self._df is not None else []
+
+        items = self.tree.get_children()
+        for item in items[len(rows):]:
+            self.tree.delete(item)
+        for i, row in enumerate(rows):
+            if i < len(items):
+                self.tree.item(items[i], values=row)
+            else:
+                self.tree.insert('', 'end', values=row)
+
+        if self.row_count:
+            first = self._offset / self.row_count
+            last = min(1.0, (self._offset + len(rows)) / self.row_count)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
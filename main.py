@@ -1,46 +1,96 @@
-import customtkinter as ctk
-from gui.main_window import MainWindow
+import argparse
+import json
 import sys
-import nltk
-import os
-
-def setup_nltk():
-    """Configure les ressources NLTK nécessaires"""
-    # Configuration du chemin NLTK
-    nltk_data_path = os.path.join(os.path.expanduser("~"), "nltk_data")
-    if not os.path.exists(nltk_data_path):
-        os.makedirs(nltk_data_path)
-    nltk.data.path.append(nltk_data_path)
-    
-    # Téléchargement des ressources nécessaires
-    required_resources = [
-        'punkt',
-        'averaged_perceptron_tagger',
-        'wordnet',
-        'stopwords'
-    ]
-    
-    for resource in required_resources:
-        try:
-            nltk.data.find(f'tokenizers/{resource}' if resource == 'punkt' else f'corpora/{resource}')
-        except LookupError:
-            nltk.download(resource, download_dir=nltk_data_path)
-
-def main():
-    # Configuration de NLTK
-    setup_nltk()
-    
+import time
+
+def run_gui(args):
+    """Lance l'interface graphique"""
+    # Tk n'est importé que pour l'interface : le mode ligne de commande s'en passe
+    import customtkinter as ctk
+    from gui.main_window import MainWindow
+
     # Configuration du thème
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
 
+    if args.trace:
+        from analysis import tracing
+        tracing.enable(sink=args.trace)
+
     # Création de la fenêtre principale
     app = MainWindow()
     app.title("Analyseur de Données Excel")
     app.geometry("1200x800")
-    
+
     # Lancement de l'application
     app.mainloop()
 
+def run_analyze(args):
+    """Analyse des classeurs en ligne de commande et écrit les résultats en JSON"""
+    from analysis.batch import analyze_files
+
+    def report(result):
+        # Progression sur stderr : stdout reste réservé au JSON
+        status = "erreur" if result['error'] else f"{result['rows']} lignes"
+        print(f"{result['file']} : {status} en {result['seconds']['total']:.2f} s", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = analyze_files(
+        args.files,
+        args.query,
+        out_dir=args.out,
+        formats=args.format,
+        max_workers=args.workers,
+        on_result=report,
+        trace=args.trace
+    )
+    elapsed = time.perf_counter() - start
+
+    output = {
+        'files': results,
+        'seconds': elapsed,
+        'files_per_second': len(results) / elapsed if elapsed else None
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2, default=str)
+    else:
+        json.dump(output, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        print()
+
+    failed = any(
+        result['error'] or any(query['error'] for query in result['queries'])
+        for result in results
+    )
+    return 1 if failed else 0
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Analyseur de Données Excel")
+    parser.add_argument('--trace', metavar='FICHIER',
+                        help="Mesurer chaque étape (durée, CPU, mémoire) et l'ajouter à ce fichier JSON lines")
+    commands = parser.add_subparsers(dest='command')
+
+    analyze = commands.add_parser('analyze', help="Analyser des classeurs sans interface graphique")
+    analyze.add_argument('files', nargs='+', help="Classeurs Excel à analyser")
+    analyze.add_argument('-q', '--query', action='append', required=True,
+                         help="Requête d'analyse (peut être répétée)")
+    analyze.add_argument('-o', '--out', help="Dossier où enregistrer les graphiques")
+    analyze.add_argument('-f', '--format', action='append', choices=['png', 'svg', 'pdf'],
+                         help="Format des graphiques (png par défaut, peut être répété)")
+    analyze.add_argument('-w', '--workers', type=int, help="Nombre de processus (par défaut, un par cœur)")
+    analyze.add_argument('--json', help="Fichier de résultats JSON (par défaut, sortie standard)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'analyze' and not args.format:
+        args.format = ['png']
+    return args
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == 'analyze':
+        return run_analyze(args)
+    run_gui(args)
+    return 0
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
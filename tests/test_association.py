@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from analysis.association import rank_relationships
+
+
+def test_independent_columns_score_zero():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f'c{i}': rng.integers(0, 50, 2000).astype(str) for i in range(4)})
+    df['x'] = rng.normal(size=2000)
+
+    scores = rank_relationships(df, [f'c{i}' for i in range(4)], ['x'])
+
+    assert all(score == 0.0 for score, _, _ in scores)
+
+
+def test_associated_columns_are_ranked_first():
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, 5, 2000)
+    df = pd.DataFrame({
+        'groupe': groups.astype(str),
+        'bruit': rng.integers(0, 5, 2000).astype(str),
+        'valeur': groups + rng.normal(size=2000)
+    })
+
+    score, col1, col2 = rank_relationships(df, ['groupe', 'bruit'], ['valeur'])[0]
+
+    assert (col1, col2) == ('groupe', 'valeur')
+    assert score > 0.5
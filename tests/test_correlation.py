@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from analysis.correlation import correlation_matrix
+
+
+def _frame(missing):
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=500)
+    df = pd.DataFrame({
+        'a': base,
+        'b': base ** 3 + rng.normal(scale=0.5, size=500),
+        'c': rng.normal(size=500),
+        'd': -base + rng.normal(scale=0.2, size=500)
+    })
+    if missing:
+        df.loc[rng.choice(500, 80, replace=False), 'a'] = np.nan
+        df.loc[rng.choice(500, 120, replace=False), 'b'] = np.nan
+        df.loc[:40, 'd'] = np.nan
+    return df
+
+
+def test_matches_pandas_with_missing_values():
+    for missing in (False, True):
+        df = _frame(missing)
+        for method in ('pearson', 'spearman'):
+            expected = df.corr(method=method).to_numpy()
+            result = correlation_matrix(df, method=method).to_numpy()
+            np.testing.assert_allclose(result, expected, atol=1e-4)
+
+
+def test_same_content_shares_cached_matrix():
+    df = _frame(True)
+
+    assert correlation_matrix(df) is correlation_matrix(df.copy())
+
+
+def test_spearman_matches_pandas_with_ties_and_shared_patterns():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.integers(0, 6, size=(300, 8)).astype(float))
+    df.loc[rng.choice(300, 40, replace=False), [1, 2]] = np.nan
+    df.loc[rng.choice(300, 25, replace=False), 4] = np.nan
+    df.loc[:60, 6] = np.nan
+    df[7] = 3.0
+    df.loc[:5, 7] = np.nan
+
+    for min_periods in (1, 250):
+        expected = df.corr(method='spearman', min_periods=min_periods).to_numpy()
+        result = correlation_matrix(df, method='spearman', min_periods=min_periods).to_numpy()
+        np.testing.assert_allclose(result, expected, atol=1e-4)
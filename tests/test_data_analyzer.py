@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from analysis.data_analyzer import DataAnalyzer
+
+
+def test_preprocess_keeps_dates_with_missing_values():
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-31', None, '2024-03-31']),
+        'Ventes': [10.0, np.nan, 30.0]
+    })
+
+    cleaned = DataAnalyzer()._preprocess_data(df)
+
+    assert pd.api.types.is_datetime64_any_dtype(cleaned['Date'])
+    assert cleaned['Date'].isna().sum() == 1
+    # Les autres colonnes non textuelles restent complétées par '' comme avant
+    assert cleaned['Ventes'].tolist() == [10.0, '', 30.0]
+
+
+def test_dates_with_missing_values_are_not_clustered():
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-31', None, '2024-03-31', '2024-04-30']),
+        'Ventes': [10, 20, 30, 40]
+    })
+
+    results = DataAnalyzer().analyze(df, "évolution de Date")
+
+    assert results['columns'] == ['Date']
+    assert pd.api.types.is_datetime64_any_dtype(results['data']['Date'])
+    assert results['data']['Date'].isna().sum() == 1
+
+
+def test_box_analysis_keeps_group_labels():
+    regions = [f'Région {c}' for c in 'ABCDEFG']
+    df = pd.DataFrame({
+        'Région': np.repeat(regions, 20),
+        'Ventes': np.arange(140, dtype=float)
+    })
+
+    results = DataAnalyzer().analyze(df, "Distribution de Ventes par Région")
+
+    assert results['chart_type'] == 'box'
+    # Les groupes des boîtes sont les régions, pas des numéros de cluster
+    assert sorted(results['data']['Région'].unique()) == [region.lower() for region in regions]
@@ -0,0 +1,25 @@
+import threading
+
+import pandas as pd
+
+from analysis import fingerprint
+
+
+def test_forget_runs_while_versions_lock_is_held():
+    # Rappel d'une référence faible déclenché par le ramasse-miettes pendant data_version
+    done = threading.Event()
+
+    def run():
+        with fingerprint._versions_lock:
+            fingerprint._forget(-1, None)
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+
+    assert done.wait(5)
+
+
+def test_shared_copy_keeps_data_version():
+    df = pd.DataFrame({'a': [1, 2, 3]})
+
+    assert fingerprint.data_version(fingerprint.shared_copy(df)) == fingerprint.data_version(df)
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from analysis.data_analyzer import DataAnalyzer
+from analysis.result_cache import ResultCache
+
+
+def _frame():
+    return pd.DataFrame({'Ville': ['Paris', 'Lyon', 'Paris', 'Nice'] * 50, 'Ventes': np.arange(200.0)})
+
+
+def test_unwritable_cache_dir_does_not_break_analysis(tmp_path):
+    blocker = tmp_path / 'fichier'
+    blocker.write_text('')
+    # Le dossier du cache ne peut pas être créé : un fichier occupe son chemin parent
+    cache = ResultCache(cache_dir=os.path.join(blocker, 'cache'), persist=True)
+    analyzer = DataAnalyzer(result_cache=cache)
+
+    analyzer.get_suggestions(_frame())
+    results = analyzer.analyze(_frame(), "répartition de Ville")
+
+    assert results['columns'] == ['Ville']
+
+
+def test_analysis_frames_stay_in_memory(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path), persist=True)
+    analyzer = DataAnalyzer(result_cache=cache)
+
+    first = analyzer.analyze(_frame(), "répartition de Ville")
+    second = analyzer.analyze(_frame(), "  RÉPARTITION de ville ")
+
+    assert second['data'].equals(first['data'])
+    assert cache.stats()['hits'] == 1
+    assert not list(tmp_path.glob('*.pkl'))
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache(max_bytes=3000)
+    for key in 'abcd':
+        cache.put(key, np.zeros(1000, dtype=np.uint8))
+
+    assert cache.get('a') is None
+    assert cache.get('d') is not None
+    assert cache.stats()['bytes'] <= 3000
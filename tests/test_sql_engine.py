@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from analysis.data_analyzer import DataAnalyzer
+from analysis.sql_engine import is_select
+
+
+def test_is_select():
+    assert is_select("SELECT 1")
+    assert is_select("  with t as (select 1) select * from t")
+    assert is_select("-- total\nSELECT COUNT(*) FROM donnees")
+    assert not is_select("DROP TABLE donnees")
+    assert not is_select("PRAGMA table_info(donnees)")
+
+
+def test_analyze_sql_rejects_writes_before_running_them():
+    df = pd.DataFrame({'Ville': ['Paris', 'Lyon'], 'Ventes': [1, 2]})
+    analyzer = DataAnalyzer()
+
+    with pytest.raises(Exception, match="lecture"):
+        analyzer.analyze_sql(df, "DELETE FROM donnees")
+
+    result = analyzer.analyze_sql(df, "SELECT Ville, SUM(Ventes) AS total FROM donnees GROUP BY Ville")
+    assert len(result['data']) == 2